@@ -0,0 +1,138 @@
+import sys
+from typing import Any, Dict, NamedTuple, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from record_table import IntArray, RecordTable
+
+DEFAULT_PERCENTILES = (25.0, 50.0, 75.0, 90.0)
+
+
+class GroupStats(NamedTuple):
+    size: int
+    mean: float
+    median: float
+    min: float
+    max: float
+    percentiles: Dict[float, float]
+
+
+def _group_percentiles(
+    sorted_values: npt.NDArray[np.float64],
+    starts: IntArray,
+    counts: IntArray,
+    percentile: float,
+) -> npt.NDArray[np.float64]:
+    """Linear-interpolated percentile of every group at once (numpy's default)."""
+    position = starts + (percentile / 100.0) * (counts - 1)
+    low = np.floor(position).astype(np.int64)
+    high = np.ceil(position).astype(np.int64)
+    fraction = position - low
+    result: npt.NDArray[np.float64] = sorted_values[low] + fraction * (
+        sorted_values[high] - sorted_values[low]
+    )
+    return result
+
+
+def grouped_stats(
+    values: npt.ArrayLike,
+    keys: npt.ArrayLike,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+) -> Dict[Any, GroupStats]:
+    """Count, mean, median, min, max and percentiles of values grouped by keys.
+
+    Every statistic is computed for all groups with NumPy reductions over one
+    sort, never with a Python loop over the records.
+    """
+    value_array = np.asarray(values, dtype=np.float64)
+    groups, inverse = np.unique(np.asarray(keys), return_inverse=True)
+    if len(groups) == 0:
+        return {}
+
+    counts = np.bincount(inverse, minlength=len(groups))
+    means = np.bincount(inverse, weights=value_array, minlength=len(groups)) / counts
+
+    # Sort by group, then by value, so each group is a sorted contiguous run
+    order = np.lexsort((value_array, inverse))
+    sorted_values = value_array[order]
+    starts = np.zeros(len(groups), dtype=np.int64)
+    np.cumsum(counts[:-1], out=starts[1:])
+    ends = starts + counts - 1
+
+    medians = _group_percentiles(sorted_values, starts, counts, 50.0)
+    by_percentile = {
+        p: _group_percentiles(sorted_values, starts, counts, p) for p in percentiles
+    }
+    return {
+        group.item(): GroupStats(
+            size=int(counts[i]),
+            mean=float(means[i]),
+            median=float(medians[i]),
+            min=float(sorted_values[starts[i]]),
+            max=float(sorted_values[ends[i]]),
+            percentiles={p: float(by_percentile[p][i]) for p in percentiles},
+        )
+        for i, group in enumerate(groups)
+    }
+
+
+def salary_by_working_status(
+    table: RecordTable, percentiles: Sequence[float] = DEFAULT_PERCENTILES
+) -> Dict[bool, GroupStats]:
+    """Salary statistics for employees who are and are not currently working."""
+    return grouped_stats(table.salary, table.is_working, percentiles)
+
+
+def age_histogram(
+    table: RecordTable, bins: int = 10
+) -> Tuple[IntArray, npt.NDArray[np.float64]]:
+    """Counts and bin edges of the age distribution."""
+    counts, edges = np.histogram(table.age, bins=bins)
+    return counts.astype(np.int64), edges
+
+
+def note_satisfaction_by_year(table: RecordTable) -> Dict[int, Tuple[int, float]]:
+    """Number of notes and the share of satisfied notes for each note year."""
+    years, inverse = np.unique(table.note_year, return_inverse=True)
+    totals = np.bincount(inverse, minlength=len(years))
+    satisfied = np.bincount(
+        inverse, weights=table.note_satisfied.astype(np.float64), minlength=len(years)
+    )
+    rates = satisfied / np.maximum(totals, 1)
+    return {
+        int(year): (int(total), float(rate))
+        for year, total, rate in zip(years, totals, rates)
+    }
+
+
+def print_report(table: RecordTable) -> None:
+    """Print the salary, age and note satisfaction report."""
+    print("=== SALARY BY WORKING STATUS ===")
+    for is_working, stats in sorted(salary_by_working_status(table).items()):
+        label = "Working" if is_working else "Not working"
+        print(
+            f"{label}: count={stats.size}, mean={stats.mean:.2f}, "
+            f"median={stats.median:.2f}, min={stats.min:.0f}, max={stats.max:.0f}"
+        )
+        for percentile, value in stats.percentiles.items():
+            print(f"  p{percentile:g}: {value:.2f}")
+
+    print("\n=== AGE HISTOGRAM ===")
+    counts, edges = age_histogram(table)
+    scale = 50 / max(int(counts.max()), 1) if len(counts) else 0.0
+    for count, low, high in zip(counts, edges[:-1], edges[1:]):
+        print(f"{low:5.1f} - {high:5.1f}: {'#' * round(count * scale)} ({count})")
+
+    print("\n=== NOTE SATISFACTION BY YEAR ===")
+    for year, (total, rate) in note_satisfaction_by_year(table).items():
+        print(f"{year}: {total} notes, {rate:.0%} satisfied")
+
+
+def main() -> None:
+    path = sys.argv[1] if len(sys.argv) > 1 else "data/documents.csv"
+    print_report(RecordTable.from_file(path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+import argparse
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    cast,
+)
+
+from models import model_name
+from pipeline import MODELS
+from readers import iter_records
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_BATCH_SIZE = 1000
+# Batches a file may have parsed but not yet had yielded; beyond this its
+# worker waits for the consumer, so memory stays bounded however slow it is
+MAX_PENDING_BATCHES = 4
+_POLL_INTERVAL = 0.1
+
+FileResult = Tuple[str, List[Any]]
+# (file key, records); a None batch marks the end of that file
+Batch = Tuple[int, Optional[List[Any]]]
+
+
+class _Channel(NamedTuple):
+    """What the workers share with the consumer.
+
+    credits holds one semaphore per in-flight file slot, counting the
+    batches that file may still send; stop asks every worker to give up.
+    Threading or multiprocessing primitives, depending on the pool.
+    """
+
+    results: "queue.Queue[Batch]"
+    credits: Sequence[Any]
+    stop: Any
+
+
+# The channel of a pool worker process, set by _init_worker
+_channel: Optional[_Channel] = None
+
+
+def _init_worker(channel: _Channel) -> None:
+    """Process pool initializer: keep the channel to the consumer."""
+    global _channel
+    _channel = channel
+    # Batches of files nobody waits for any more are dropped on exit
+    channel.results.cancel_join_thread()  # type: ignore[attr-defined]
+
+
+def _acquire(credit: Any, stop: Any) -> bool:
+    """Wait for a credit; False once stop is set."""
+    while not credit.acquire(timeout=_POLL_INTERVAL):
+        if stop.is_set():
+            return False
+    if stop.is_set():
+        credit.release()
+        return False
+    return True
+
+
+def _stream_file(
+    key: int,
+    slot: int,
+    path: str,
+    model: str,
+    batch_size: int,
+    channel: Optional[_Channel] = None,
+) -> int:
+    """Worker: stream one file and send its records in batches; returns the count.
+
+    Only the path is passed in: the worker opens the file itself and parses
+    it with the registered streaming reader. Each batch is parsed only once
+    its slot has a credit, so a slow consumer pauses the worker, and a
+    stop request ends it between batches. The end marker is sent even when
+    parsing fails; the error then surfaces through the returned future.
+    """
+    channel = channel or _channel
+    assert channel is not None, "worker started without a channel"
+    credit = channel.credits[slot]
+    count = 0
+    records = iter_records(path, model)
+    try:
+        while _acquire(credit, channel.stop):
+            batch = list(islice(records, batch_size))
+            if not batch:
+                credit.release()
+                break
+            channel.results.put((key, batch))
+            count += len(batch)
+    finally:
+        if not channel.stop.is_set():
+            channel.results.put((key, None))
+    return count
+
+
+def _next_batch(
+    channel: _Channel, futures: Dict[int, "Future[int]"]
+) -> Optional[Batch]:
+    """Block until a worker sends a batch; None once stop is set.
+
+    Polls so that a worker process that died without its end marker (a
+    broken pool) raises here instead of blocking forever.
+    """
+    while not channel.stop.is_set():
+        try:
+            return channel.results.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            for future in list(futures.values()):
+                if future.done():
+                    future.result()
+    return None
+
+
+async def aiter_file_records(
+    paths: Iterable[str],
+    model: Any = "pydantic",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    workers: Optional[int] = None,
+    ordered: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> AsyncGenerator[FileResult, None]:
+    """Load many files concurrently, yielding (path, records) batches.
+
+    At most concurrency files are in flight at once. Each file is opened and
+    streamed by a pool of workers processes (workers=0 uses threads instead,
+    which suits many tiny files), which send up to batch_size records at a
+    time. Batches are yielded as soon as they arrive, or file by file in
+    input order when ordered is True; files without records yield nothing.
+
+    Each file runs at most MAX_PENDING_BATCHES batches ahead of the
+    consumer. Breaking out early or a failing file stops the workers after
+    their current batch.
+    """
+    name = model_name(model)
+    # Every file holds at most MAX_PENDING_BATCHES batches plus its end marker
+    maxsize = concurrency * (MAX_PENDING_BATCHES + 1)
+    slot_range = range(concurrency)
+    executor: Executor
+    if workers == 0:
+        channel = _Channel(
+            queue.Queue(maxsize),
+            [threading.Semaphore(MAX_PENDING_BATCHES) for _ in slot_range],
+            threading.Event(),
+        )
+        executor = ThreadPoolExecutor(concurrency)
+        extra: Tuple[Any, ...] = (channel,)
+    else:
+        import multiprocessing
+
+        channel = _Channel(
+            cast("queue.Queue[Batch]", multiprocessing.Queue(maxsize)),
+            [multiprocessing.Semaphore(MAX_PENDING_BATCHES) for _ in slot_range],
+            multiprocessing.Event(),
+        )
+        executor = ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(channel,)
+        )
+        extra = ()
+
+    files = enumerate(paths)
+    names: Dict[int, str] = {}
+    slots: Dict[int, int] = {}
+    free_slots = list(slot_range)
+    futures: Dict[int, "Future[int]"] = {}
+    # Files not yet fully yielded, in input order, with the batches held back
+    waiting: Deque[int] = deque()
+    held: Dict[int, List[List[Any]]] = {}
+    finished: Set[int] = set()
+
+    def start_next() -> bool:
+        if not free_slots:
+            return False
+        for key, path in files:
+            names[key] = path
+            slots[key] = free_slots.pop()
+            futures[key] = executor.submit(
+                _stream_file, key, slots[key], path, name, batch_size, *extra
+            )
+            if ordered:
+                waiting.append(key)
+                held[key] = []
+            return True
+        return False
+
+    def release(key: int, batch: List[Any]) -> FileResult:
+        """Give the credit of a batch back to its file as it is handed out."""
+        channel.credits[slots[key]].release()
+        return names[key], batch
+
+    def close(key: int) -> None:
+        free_slots.append(slots.pop(key))
+        del names[key]
+
+    try:
+        while start_next():
+            pass
+        while futures:
+            received = await asyncio.to_thread(_next_batch, channel, futures)
+            assert received is not None  # stop is only set on the way out
+            key, batch = received
+            if batch is not None:
+                if ordered and key != waiting[0]:
+                    held[key].append(batch)
+                else:
+                    yield release(key, batch)
+                continue
+            await asyncio.wrap_future(futures.pop(key))  # raises worker errors
+            if not ordered:
+                close(key)
+            else:
+                # Pass the head on to the next unfinished file, releasing
+                # the batches received for it so far
+                finished.add(key)
+                while waiting and waiting[0] in finished:
+                    done = waiting.popleft()
+                    finished.remove(done)
+                    del held[done]
+                    close(done)
+                    if waiting:
+                        head = waiting[0]
+                        early, held[head] = held[head], []
+                        for batch in early:
+                            yield release(head, batch)
+            while start_next():
+                pass
+    finally:
+        # Stop outstanding work if the caller breaks out early or a file fails;
+        # running workers notice between batches
+        channel.stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def aiter_records(
+    paths: Iterable[str],
+    model: Any = "pydantic",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    workers: Optional[int] = None,
+    ordered: bool = False,
+) -> AsyncIterator[Any]:
+    """Merged stream of the records of many files; see aiter_file_records."""
+    async for _, records in aiter_file_records(
+        paths, model, concurrency, workers, ordered
+    ):
+        for record in records:
+            yield record
+
+
+def load_many(
+    paths: Iterable[str],
+    model: Any = "pydantic",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    workers: Optional[int] = None,
+) -> Dict[str, List[Any]]:
+    """Blocking helper: the records of every file, keyed by path in input order."""
+
+    paths = list(paths)
+
+    async def collect() -> Dict[str, List[Any]]:
+        loaded: Dict[str, List[Any]] = {path: [] for path in paths}
+        files = aiter_file_records(paths, model, concurrency, workers, ordered=True)
+        async for path, batch in files:
+            loaded[path].extend(batch)
+        return loaded
+
+    return asyncio.run(collect())
+
+
+def iter_many(
+    paths: Iterable[str],
+    model: Any = "pydantic",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    workers: Optional[int] = None,
+) -> Iterator[FileResult]:
+    """Blocking iterator over the (path, records) batches of every file in order.
+
+    Unlike load_many, only the batches not yet consumed are held in memory,
+    so synchronous code can stream the results of many files.
+    """
+    loop = asyncio.new_event_loop()
+    files = aiter_file_records(paths, model, concurrency, workers, ordered=True)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(anext(files))
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(files.aclose())
+        loop.close()
+
+
+async def _report(args: argparse.Namespace) -> None:
+    start = time.perf_counter()
+    counts: Dict[str, int] = dict.fromkeys(args.paths, 0) if args.ordered else {}
+    async for path, records in aiter_file_records(
+        args.paths,
+        args.model,
+        args.concurrency,
+        args.workers,
+        args.ordered,
+    ):
+        counts[path] = counts.get(path, 0) + len(records)
+    elapsed = time.perf_counter() - start
+    for path in args.paths:
+        counts.setdefault(path, 0)
+    for path, count in counts.items():
+        print(f"{path}: {count:,} records")
+    total = sum(counts.values())
+    print(f"Loaded {total:,} records from {len(args.paths)} files in {elapsed:.3f} s")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Load many documents.* files concurrently."
+    )
+    parser.add_argument("paths", nargs="+", help="files of any registered format")
+    parser.add_argument("--model", choices=MODELS, default="pydantic")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="parser processes (default: one per CPU, 0: parse in threads)",
+    )
+    parser.add_argument(
+        "--ordered", action="store_true", help="report files in input order"
+    )
+    asyncio.run(_report(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
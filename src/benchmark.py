@@ -0,0 +1,490 @@
+import argparse
+import bz2
+import gzip
+import importlib
+import json
+import lzma
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from generate_data import write_dataset
+from pipeline import MODELS
+from readers import decompress, get_reader, iter_records
+
+FORMATS = ("csv", "json", "yaml", "xml")
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_REPEAT = 3
+# Import times are short and noisy, so startup keeps the best of more runs
+STARTUP_REPEAT = 5
+_READ_BLOCK_SIZE = 1024 * 1024
+
+
+# ==================== DATASETS ====================
+def prepare_datasets(
+    directory: str,
+    sizes: Sequence[int],
+    formats: Sequence[str] = FORMATS,
+    seed: int = 0,
+) -> Dict[str, Dict[int, str]]:
+    """Generate (or reuse) one dataset per format and size inside directory."""
+    os.makedirs(directory, exist_ok=True)
+    paths: Dict[str, Dict[int, str]] = {fmt: {} for fmt in formats}
+    for fmt in formats:
+        for size in sizes:
+            path = os.path.join(directory, f"documents_{size}_seed{seed}.{fmt}")
+            if not os.path.exists(path):
+                write_dataset(path, fmt, size, seed)
+            paths[fmt][size] = path
+    return paths
+
+
+# ==================== MEASUREMENT ====================
+def _peak_rss_bytes() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+def measure_case(path: str, model: str, repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    """Time the read, parse and build stages of one format/model combination.
+
+    Records are built by iter_records, the path load_records takes, so the
+    pydantic model is validated in batches as in real loads. Runs in a fresh
+    worker process so that the peak RSS belongs to this case. Each stage
+    keeps the best of repeat runs. A final untimed pass keeps every record
+    alive under tracemalloc to measure the memory held per record.
+    """
+    reader = get_reader(path)
+    read_s = parse_s = total_s = float("inf")
+    records = 0
+    # One-time setup (e.g. importing pydantic and building its validators)
+    # is not part of the per-load cost
+    next(iter_records(path, model), None)
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with open(path, "rb") as f:
+            while f.read(_READ_BLOCK_SIZE):
+                pass
+        read_s = min(read_s, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        records = sum(1 for _ in reader.iter_rows(path))
+        parse_s = min(parse_s, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in iter_records(path, model):
+            pass
+        total_s = min(total_s, time.perf_counter() - start)
+
+    tracemalloc.start()
+    kept = list(iter_records(path, model))
+    retained_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+
+    return {
+        "path": path,
+        "model": model,
+        "records": records,
+        "bytes": os.path.getsize(path),
+        "stages": {
+            "read_s": read_s,
+            "parse_s": max(parse_s - read_s, 0.0),
+            "build_s": max(total_s - parse_s, 0.0),
+        },
+        "total_s": total_s,
+        "records_per_s": records / total_s if total_s > 0 else 0.0,
+        "bytes_per_record": retained_bytes / records if records else 0.0,
+        "peak_rss_bytes": _peak_rss_bytes(),
+    }
+
+
+def run_benchmarks(
+    datasets: Dict[str, Dict[int, str]],
+    models: Sequence[str] = MODELS,
+    repeat: int = DEFAULT_REPEAT,
+) -> List[Dict[str, Any]]:
+    """Measure every format x model x size combination, each in its own process."""
+    results = []
+    for fmt, by_size in datasets.items():
+        for size, path in sorted(by_size.items()):
+            for model in models:
+                with ProcessPoolExecutor(
+                    max_workers=1, mp_context=get_context("spawn")
+                ) as executor:
+                    result = executor.submit(measure_case, path, model, repeat).result()
+                result.update(format=fmt, size=size)
+                results.append(result)
+                print(
+                    f"{fmt:>4} {model:>10} {size:>10,} records: "
+                    f"{result['records_per_s']:>12,.0f} records/s, "
+                    f"{result['total_s']:.3f} s, "
+                    f"{result['bytes_per_record']:>6,.0f} bytes/record"
+                )
+    return results
+
+
+# ==================== COMPRESSION ====================
+def _zstd_compress(data: bytes) -> bytes:
+    try:
+        zstd: Any = importlib.import_module("compression.zstd")  # Python 3.14+
+    except ImportError:
+        return bytes(
+            importlib.import_module("zstandard").ZstdCompressor().compress(data)
+        )
+    return bytes(zstd.compress(data))
+
+
+COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {
+    "gz": gzip.compress,
+    "bz2": bz2.compress,
+    "xz": lzma.compress,
+    "zst": _zstd_compress,
+}
+
+
+def compress_dataset(path: str, compression: str) -> str:
+    """Create (or reuse) a compressed copy of path and return its path."""
+    target = f"{path}.{compression}"
+    if not os.path.exists(target):
+        with open(path, "rb") as f:
+            data = COMPRESSORS[compression](f.read())
+        with open(target, "wb") as f:
+            f.write(data)
+    return target
+
+
+def measure_compressed_case(
+    path: str, model: str, repeat: int = DEFAULT_REPEAT
+) -> Dict[str, Any]:
+    """Compare parsing a compressed file as a stream with decompressing it first.
+
+    The second approach writes the decompressed data to a temporary file and
+    parses that, as the loaders required before compressed input was supported.
+    """
+    stream_s = temp_s = float("inf")
+    next(iter_records(path, model), None)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in iter_records(path, model):
+            pass
+        stream_s = min(stream_s, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        suffix = os.path.splitext(os.path.splitext(path)[0])[1]
+        with tempfile.TemporaryDirectory() as directory:
+            temp_path = os.path.join(directory, "data" + suffix)
+            with open(path, "rb") as source, open(temp_path, "wb") as target:
+                shutil.copyfileobj(decompress(source, path), target, _READ_BLOCK_SIZE)
+            for _ in iter_records(temp_path, model):
+                pass
+        temp_s = min(temp_s, time.perf_counter() - start)
+
+    return {
+        "path": path,
+        "model": model,
+        "bytes": os.path.getsize(path),
+        "stream_s": stream_s,
+        "decompress_then_parse_s": temp_s,
+    }
+
+
+def run_compression_benchmarks(
+    datasets: Dict[str, Dict[int, str]],
+    compressions: Sequence[str],
+    models: Sequence[str] = MODELS,
+    repeat: int = DEFAULT_REPEAT,
+) -> List[Dict[str, Any]]:
+    """Measure streaming decompression against decompress-then-parse."""
+    results = []
+    for fmt, by_size in datasets.items():
+        for size, path in sorted(by_size.items()):
+            for compression in compressions:
+                compressed = compress_dataset(path, compression)
+                for model in models:
+                    result = measure_compressed_case(compressed, model, repeat)
+                    result.update(format=fmt, size=size, compression=compression)
+                    results.append(result)
+                    print(
+                        f"{fmt:>4} {compression:>4} {model:>10} {size:>10,} records: "
+                        f"stream {result['stream_s']:.3f} s, decompress then parse "
+                        f"{result['decompress_then_parse_s']:.3f} s"
+                    )
+    return results
+
+
+# ==================== VALIDATION ====================
+def measure_validation(path: str, repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    """Compare batched FileData validation with one model_validate per record.
+
+    The file is parsed into plain dicts once, untimed, so that only the
+    validation step of the pydantic model is measured.
+    """
+    from pydantic_models import VALIDATION_BATCH_SIZE, FileData, validate_file_data
+
+    rows = list(iter_records(path, "typeddict"))
+    batched_s = per_record_s = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in validate_file_data(rows):
+            pass
+        batched_s = min(batched_s, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for row in rows:
+            FileData.model_validate(row)
+        per_record_s = min(per_record_s, time.perf_counter() - start)
+
+    return {
+        "path": path,
+        "records": len(rows),
+        "batch_size": VALIDATION_BATCH_SIZE,
+        "batched_s": batched_s,
+        "per_record_s": per_record_s,
+        "speedup": per_record_s / batched_s if batched_s > 0 else 0.0,
+    }
+
+
+def run_validation_benchmarks(
+    datasets: Dict[str, Dict[int, str]], repeat: int = DEFAULT_REPEAT
+) -> List[Dict[str, Any]]:
+    """Measure batched against per-record validation for every dataset."""
+    results = []
+    for fmt, by_size in datasets.items():
+        for size, path in sorted(by_size.items()):
+            result = measure_validation(path, repeat)
+            result.update(format=fmt, size=size)
+            results.append(result)
+            print(
+                f"{fmt:>4} validation {size:>10,} records: "
+                f"batched {result['batched_s']:.3f} s, "
+                f"per record {result['per_record_s']:.3f} s "
+                f"({result['speedup']:.2f}x)"
+            )
+    return results
+
+
+# ==================== STARTUP ====================
+# Command-line modules whose import cost every invocation pays
+STARTUP_MODULES = (
+    "process_csv",
+    "process_JSON",
+    "process_yaml",
+    "process_xml",
+    "async_loader",
+    "writers",
+)
+# Dependencies that dominate startup when they are imported eagerly
+HEAVY_MODULES = ("pydantic", "numpy", "pandas", "yaml")
+
+
+def _parse_importtime(output: str, module: str) -> Dict[str, Any]:
+    """Read the -X importtime report of "import module" from stderr output.
+
+    Each line is "import time: self | cumulative | name" in microseconds,
+    with the name indented two spaces per nesting level; a module's line
+    follows the lines of the modules it imported.
+    """
+    loaded = set()
+    children: List[Dict[str, Any]] = []
+    total_us = 0
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        loaded.add(name.split(".")[0])
+        if depth == 0:
+            if name == module:
+                total_us = int(cumulative)
+                break
+            children = []
+        elif depth == 1:
+            children.append({"module": name, "import_ms": int(cumulative) / 1000})
+    children.sort(key=lambda child: child["import_ms"], reverse=True)
+    return {
+        "import_ms": total_us / 1000,
+        "heavy": [name for name in HEAVY_MODULES if name in loaded],
+        "slowest": children[:5],
+    }
+
+
+def measure_startup(module: str, repeat: int = STARTUP_REPEAT) -> Dict[str, Any]:
+    """Time "import module" in fresh interpreters with -X importtime.
+
+    Keeps the run with the lowest import time, plus the best wall time of
+    the whole interpreter (startup, import and exit).
+    """
+    source_dir = os.path.dirname(os.path.abspath(__file__))
+    best: Dict[str, Any] = {}
+    wall_s = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=source_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        wall_s = min(wall_s, time.perf_counter() - start)
+        result = _parse_importtime(completed.stderr, module)
+        if not best or result["import_ms"] < best["import_ms"]:
+            best = result
+    return {"module": module, **best, "wall_ms": wall_s * 1000}
+
+
+def run_startup_benchmarks(
+    modules: Sequence[str] = STARTUP_MODULES, repeat: int = STARTUP_REPEAT
+) -> List[Dict[str, Any]]:
+    """Measure the import cost of each command-line module."""
+    results = []
+    for module in modules:
+        result = measure_startup(module, repeat)
+        results.append(result)
+        slowest = ", ".join(
+            f"{child['module']} {child['import_ms']:.0f}" for child in result["slowest"]
+        )
+        print(
+            f"{module:>14}: import {result['import_ms']:6.1f} ms, "
+            f"wall {result['wall_ms']:6.1f} ms, "
+            f"heavy: {', '.join(result['heavy']) or '-'}; slowest: {slowest}"
+        )
+    return results
+
+
+# ==================== REPORTING ====================
+def write_report(
+    results: List[Dict[str, Any]],
+    path: str,
+    compression_results: Optional[List[Dict[str, Any]]] = None,
+    startup_results: Optional[List[Dict[str, Any]]] = None,
+    validation_results: Optional[List[Dict[str, Any]]] = None,
+) -> None:
+    """Write the results with run metadata as JSON."""
+    report: Dict[str, Any] = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if compression_results:
+        report["compression"] = compression_results
+    if startup_results:
+        report["startup"] = startup_results
+    if validation_results:
+        report["validation"] = validation_results
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+def compare_reports(
+    baseline_path: str, results: List[Dict[str, Any]], tolerance: float = 0.10
+) -> int:
+    """Print throughput changes against a baseline report.
+
+    Returns the number of cases that got slower by more than tolerance.
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {
+            (r["format"], r["model"], r["size"]): r for r in json.load(f)["results"]
+        }
+
+    regressions = 0
+    print("\n=== COMPARISON WITH BASELINE ===")
+    for result in results:
+        key = (result["format"], result["model"], result["size"])
+        if key not in baseline:
+            continue
+        ratio = result["records_per_s"] / max(baseline[key]["records_per_s"], 1e-9)
+        flag = ""
+        if ratio < 1 - tolerance:
+            regressions += 1
+            flag = "  <-- REGRESSION"
+        print(f"{key[0]:>4} {key[1]:>10} {key[2]:>10,}: {ratio:.2f}x{flag}")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the loaders of every format and model."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS)
+    parser.add_argument("--models", nargs="+", choices=MODELS, default=MODELS)
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        help=f"runs per case, keeping the best (default: {DEFAULT_REPEAT}, "
+        f"{STARTUP_REPEAT} with --startup)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--data-dir",
+        default=os.path.join(tempfile.gettempdir(), "projectamine-bench"),
+        help="where the synthetic datasets are created and reused",
+    )
+    parser.add_argument(
+        "--compressions",
+        nargs="+",
+        choices=COMPRESSORS,
+        default=[],
+        help="also compare streaming decompression with decompress-then-parse",
+    )
+    parser.add_argument(
+        "--startup",
+        action="store_true",
+        help="only measure the import time of the command-line modules",
+    )
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    repeat = args.repeat
+    if repeat is None:
+        repeat = STARTUP_REPEAT if args.startup else DEFAULT_REPEAT
+
+    if args.startup:
+        startup_results = run_startup_benchmarks(repeat=repeat)
+        if args.output:
+            write_report([], args.output, startup_results=startup_results)
+        return 0
+
+    datasets = prepare_datasets(args.data_dir, args.sizes, args.formats, args.seed)
+    results = run_benchmarks(datasets, args.models, repeat)
+    compression_results = run_compression_benchmarks(
+        datasets, args.compressions, args.models, repeat
+    )
+    validation_results = []
+    if "pydantic" in args.models:
+        validation_results = run_validation_benchmarks(datasets, repeat)
+    if args.output:
+        write_report(
+            results,
+            args.output,
+            compression_results,
+            validation_results=validation_results,
+        )
+    if args.compare:
+        return 1 if compare_reports(args.compare, results) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+import hashlib
+import os
+import sys
+import time
+from dataclasses import fields
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+from models import PersonTypedDict
+from readers import iter_records
+
+# NumPy, record_table, tempfile and zipfile are imported by the functions
+# that need them, so that importing this module stays cheap for the tools
+if TYPE_CHECKING:
+    from record_table import RecordTable
+
+
+def user_cache_dir() -> str:
+    """Per-user cache directory, following the XDG base directory spec."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "projectamine")
+
+
+# Default location of the parsed records, one .npz file per source. Loaders
+# only cache when given a cache_dir, so plain runs never write files
+CACHE_DIR = user_cache_dir()
+# Bump whenever the RecordTable columns change so stale caches are rebuilt
+CACHE_VERSION = 1
+# Smaller sources parse faster than NumPy imports, so they are not cached
+CACHE_MIN_SIZE = 1024 * 1024
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class SourceKey(NamedTuple):
+    """Identity of a source file; a cache entry is valid while it matches."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+def file_sha256(path: str) -> str:
+    """Hex SHA-256 of the file contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(_HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_key(path: str) -> SourceKey:
+    """Current key of a source file."""
+    stat = os.stat(path)
+    return SourceKey(
+        os.path.abspath(path), stat.st_size, stat.st_mtime_ns, file_sha256(path)
+    )
+
+
+def worth_caching(path: str) -> bool:
+    """Whether path is large enough for its cache entry to save time."""
+    return os.path.getsize(path) >= CACHE_MIN_SIZE
+
+
+def cache_path(path: str, cache_dir: str = CACHE_DIR) -> str:
+    """Location of the cache file of a source path."""
+    digest = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{os.path.basename(path)}.{digest[:16]}.npz")
+
+
+def write_entry(entry_path: str, path: str, arrays: Mapping[str, Any]) -> None:
+    """Store arrays in an .npz entry keyed by the current state of source path."""
+    import tempfile
+
+    import numpy as np
+
+    key = source_key(path)
+    directory = os.path.dirname(entry_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    # Write a temporary file first so that readers never see a partial entry
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f,
+                _version=CACHE_VERSION,
+                _path=key.path,
+                _size=key.size,
+                _mtime_ns=key.mtime_ns,
+                _sha256=key.sha256,
+                **arrays,
+            )
+        os.replace(temp_path, entry_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def read_entry(
+    entry_path: str, path: str, names: Sequence[str]
+) -> Optional[Dict[str, Any]]:
+    """Return the named arrays of an entry, or None if path has changed since.
+
+    Matching size and mtime are trusted without reading the source. When only
+    the mtime differs (e.g. after a fresh checkout) the content hash decides,
+    and the entry is rewritten with the new mtime.
+    """
+    import zipfile
+
+    import numpy as np
+
+    try:
+        with np.load(entry_path, allow_pickle=False) as data:
+            if int(data["_version"]) != CACHE_VERSION:
+                return None
+            stat = os.stat(path)
+            if int(data["_size"]) != stat.st_size:
+                return None
+            moved = int(data["_mtime_ns"]) != stat.st_mtime_ns
+            if moved and str(data["_sha256"]) != file_sha256(path):
+                return None
+            arrays = {name: data[name] for name in names}
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None  # missing, outdated or unreadable entries are misses
+    if moved:
+        try:
+            write_entry(entry_path, path, arrays)
+        except OSError:
+            pass  # the arrays are valid; the entry is just checked again next time
+    return arrays
+
+
+def save_cached_table(
+    path: str, table: "RecordTable", cache_dir: str = CACHE_DIR
+) -> None:
+    """Store the columns of table as the cache entry of the current source."""
+    columns = {field.name: getattr(table, field.name) for field in fields(table)}
+    write_entry(cache_path(path, cache_dir), path, columns)
+
+
+def load_cached_table(path: str, cache_dir: str = CACHE_DIR) -> Optional["RecordTable"]:
+    """Return the cached table of path, or None if there is no valid entry."""
+    from record_table import RecordTable
+
+    names = [field.name for field in fields(RecordTable)]
+    columns = read_entry(cache_path(path, cache_dir), path, names)
+    return None if columns is None else RecordTable(**columns)
+
+
+def cached_table(
+    path: str,
+    cache_dir: str = CACHE_DIR,
+    records: Optional[Callable[[], Iterable[Any]]] = None,
+) -> "RecordTable":
+    """Load the table of path from the cache, parsing and storing it on a miss.
+
+    records() yields the parsed records on a miss; it defaults to streaming
+    the file as PersonTypedDict records with its registered reader. Raises
+    OverflowError when a value does not fit its RecordTable column.
+    """
+    from record_table import RecordTable
+
+    table = load_cached_table(path, cache_dir)
+    if table is None:
+        parsed = records() if records else iter_records(path, PersonTypedDict)
+        table = RecordTable.from_records(parsed)
+        try:
+            save_cached_table(path, table, cache_dir)
+        except OSError:
+            pass  # e.g. a read-only cache_dir: the load still succeeds, uncached
+    return table
+
+
+def iter_cached_rows(
+    path: str,
+    cache_dir: str = CACHE_DIR,
+    records: Optional[Callable[[], Iterable[Any]]] = None,
+) -> Iterator[PersonTypedDict]:
+    """Yield the records of path as PersonTypedDict rows, through the cache.
+
+    Records with values outside the compact RecordTable columns (e.g. an age
+    above 32767) cannot be cached; they are then parsed again and yielded
+    uncached. Turn the rows into any model with TYPEDDICT_BUILDERS.
+    """
+    try:
+        return cached_table(path, cache_dir, records).iter_dicts()
+    except OverflowError:
+        return iter(records() if records else iter_records(path, PersonTypedDict))
+
+
+def main() -> None:
+    """Time a cold and a warm load of a file through the cache."""
+    path = sys.argv[1] if len(sys.argv) > 1 else "data/documents.YAML"
+    entry = cache_path(path)
+    if os.path.exists(entry):
+        os.remove(entry)
+
+    for label in ("Cold", "Warm"):
+        start = time.perf_counter()
+        table = cached_table(path)
+        elapsed = time.perf_counter() - start
+        print(f"{label} load of {len(table):,} records: {elapsed * 1000:.1f} ms")
+    print(f"Cache file: {entry} ({os.path.getsize(entry):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
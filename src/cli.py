@@ -0,0 +1,266 @@
+import argparse
+import glob
+import os
+import sys
+from contextlib import ExitStack
+from functools import partial
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, TextIO
+
+import instrumentation
+from cache import iter_cached_rows, worth_caching
+from instrumentation import STATS_FORMATS
+from models import TYPEDDICT_BUILDERS
+from pipeline import MODELS
+from readers import (
+    Source,
+    build_records,
+    compression_of,
+    get_reader,
+    iter_records,
+    reader_for_extension,
+)
+from writers import EXPORTERS, export_records
+
+# Input formats that can be forced with --input-format, e.g. for stdin
+INPUT_FORMATS = ("csv", "json", "yaml", "xml", "rec")
+PROFILE_TOP = 25
+
+
+def expand_paths(patterns: Sequence[str]) -> List[str]:
+    """Expand glob patterns (** included) in order; "-" stands for stdin."""
+    paths: List[str] = []
+    for pattern in patterns:
+        if pattern == "-" or not glob.has_magic(pattern):
+            paths.append(pattern)
+            continue
+        matches = sorted(glob.glob(pattern, recursive=True))
+        if not matches:
+            raise ValueError(f"No files match {pattern}")
+        paths.extend(matches)
+    return paths
+
+
+def iter_file_records(
+    path: str,
+    model: str = "pydantic",
+    workers: int = 1,
+    stream: bool = False,
+    cache_dir: Optional[str] = None,
+    input_format: Optional[str] = None,
+) -> Iterator[Any]:
+    """Yield the records of one file with the fastest loader that applies.
+
+    - stdin ("-") and files with a forced input_format are streamed
+    - with a cache_dir and unless stream is set, files of at least
+      CACHE_MIN_SIZE bytes are read through the cache there (record files
+      are already a cache of their own)
+    - uncompressed CSV files are parsed in chunks across workers processes
+    - everything else is streamed by the reader registered for its extension
+    """
+    if path == "-" or input_format is not None:
+        if input_format is None:
+            raise ValueError("Reading stdin needs --input-format")
+        reader = reader_for_extension("." + input_format)
+        source: Source = sys.stdin.buffer if path == "-" else path
+        return build_records(reader.iter_rows(source), reader.builders, model)
+
+    parallel_csv = workers > 1 and path.lower().endswith(".csv")
+    if (
+        not stream
+        and cache_dir is not None
+        and not compression_of(path)
+        and not path.lower().endswith(".rec")
+        and worth_caching(path)
+    ):
+        get_reader(path)  # reject unsupported extensions before caching
+        parse = None
+        if parallel_csv:
+            from process_csv import iter_csv_records_parallel
+
+            parse = partial(iter_csv_records_parallel, path, "typeddict", workers)
+        rows = iter_cached_rows(path, cache_dir, parse)
+        return build_records(rows, TYPEDDICT_BUILDERS, model)
+    if parallel_csv:
+        from process_csv import iter_csv_records_parallel
+
+        return iter_csv_records_parallel(path, model, workers)
+    return iter_records(path, model)
+
+
+def iter_all_records(
+    paths: Sequence[str],
+    model: str = "pydantic",
+    workers: int = 1,
+    stream: bool = False,
+    cache_dir: Optional[str] = None,
+    input_format: Optional[str] = None,
+) -> Iterator[Any]:
+    """Yield the records of every path in order.
+
+    Several files with workers > 1 are loaded concurrently, a whole file per
+    worker process, unless stream asks for one record at a time.
+    """
+    if workers > 1 and len(paths) > 1 and not stream and input_format is None:
+        from async_loader import iter_many
+
+        for _, records in iter_many(paths, model, workers=workers):
+            yield from records
+        return
+    for path in paths:
+        yield from iter_file_records(
+            path, model, workers, stream, cache_dir, input_format
+        )
+
+
+def run(args: argparse.Namespace, paths: Sequence[str], out: TextIO) -> int:
+    """Load paths and export their records; returns the number of records."""
+    count = 0
+
+    def counted(records: Iterable[Any]) -> Iterator[Any]:
+        nonlocal count
+        for count, record in enumerate(records, 1):
+            yield record
+
+    records = iter_all_records(
+        paths,
+        args.model,
+        args.workers,
+        args.stream,
+        args.cache_dir,
+        args.input_format,
+    )
+    export_records(counted(records), out, args.output_format)
+    return count
+
+
+def _run_profiled(
+    args: argparse.Namespace,
+    paths: Sequence[str],
+    out: TextIO,
+    collapsed: Optional[str] = None,
+) -> None:
+    """Run under the profiler and report the run to stderr.
+
+    The report covers the hottest functions, the record constructors,
+    allocation sites and peak memory; collapsed names a file for the
+    sampled stacks in the flame graph format.
+    """
+    from profiling import SAMPLE_INTERVAL, profile_call
+
+    report = profile_call(
+        run, args, paths, out, sample_interval=SAMPLE_INTERVAL if collapsed else None
+    )
+    out.flush()
+    report.records = report.result
+    report.write(sys.stderr, PROFILE_TOP)
+    if collapsed is not None:
+        with open(collapsed, "w", encoding="utf-8") as f:
+            report.write_collapsed(f)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Load documents.* files of any format and export the records."
+    )
+    parser.add_argument(
+        "paths", nargs="+", help='input files or glob patterns, "-" for stdin'
+    )
+    parser.add_argument(
+        "--input-format",
+        choices=INPUT_FORMATS,
+        help="read every input as this format (default: from the extension)",
+    )
+    parser.add_argument("--model", choices=MODELS, default="pydantic")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="processes for CSV chunks, or for several files at once",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="read one record at a time in constant memory, bypassing the cache",
+    )
+    parser.add_argument(
+        "-f", "--output-format", choices=EXPORTERS, default="text", dest="output_format"
+    )
+    parser.add_argument(
+        "-o", "--output", default="-", help='output file (default: "-", stdout)'
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        help="cache the parsed records of large files in DIR (default: no cache)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="profile the run (cProfile, tracemalloc, peak RSS) and report to stderr",
+    )
+    parser.add_argument(
+        "--collapsed",
+        metavar="PATH",
+        help="with --profile, write sampled stacks for a flame graph to PATH",
+    )
+    parser.add_argument(
+        "--stats",
+        choices=STATS_FORMATS,
+        help="report per-stage times and counters to stderr in this format",
+    )
+    parser.add_argument(
+        "--histograms",
+        action="store_true",
+        help="add per-item time histograms to --stats",
+    )
+    args = parser.parse_args(argv)
+    if "-" in args.paths and args.input_format is None:
+        parser.error("reading stdin needs --input-format")
+    if args.histograms and args.stats is None:
+        parser.error("--histograms needs --stats")
+    if args.collapsed and not args.profile:
+        parser.error("--collapsed needs --profile")
+
+    # Resolve every input before the output is created, so bad patterns and
+    # unsupported extensions leave no empty output file behind
+    try:
+        paths = expand_paths(args.paths)
+        if args.input_format is None:
+            for path in paths:
+                get_reader(path)
+    except ValueError as error:
+        parser.error(str(error))
+
+    stats = instrumentation.enable(args.histograms) if args.stats else None
+    created = False  # whether the output file was opened, and so truncated
+    try:
+        with ExitStack() as stack:
+            out: TextIO = sys.stdout
+            if args.output != "-":
+                out = stack.enter_context(
+                    open(args.output, "w", encoding="utf-8", newline="")
+                )
+                created = True
+            if args.profile:
+                _run_profiled(args, paths, out, args.collapsed)
+            else:
+                run(args, paths, out)
+            out.flush()
+        if stats is not None:
+            sys.stderr.write(STATS_FORMATS[args.stats](stats))
+    except (OSError, ValueError) as error:
+        if isinstance(error, BrokenPipeError):
+            # The reader went away (e.g. | head); silence the final flush
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 1
+        if created and os.path.isfile(args.output):
+            os.remove(args.output)  # drop the partial export
+        print(f"{parser.prog}: error: {error}", file=sys.stderr)
+        return 1
+    finally:
+        instrumentation.disable()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+import argparse
+import os
+import random
+from typing import Iterator, List, Optional, Sequence
+
+from models import NoteTypedDict, PersonTypedDict
+from writers import WRITERS
+
+CURRENT_YEAR = 2025
+FIRST_NAMES = (
+    "John",
+    "Lina",
+    "Josh",
+    "Joshua",
+    "Nea",
+    "Bea",
+    "Vemshi",
+    "Sami",
+    "Konrad",
+    "Amelie",
+    "Stephan",
+    "Lea",
+    "Luca",
+    "Mara",
+    "Tomas",
+    "Ines",
+    "Omar",
+    "Yuki",
+)
+LAST_NAMES = (
+    "Peek",
+    "Koor",
+    "Ben",
+    "Meed",
+    "Vonsha",
+    "Anne",
+    "Vinatraajsh",
+    "Miatraaj",
+    "Leem",
+    "Van",
+    "Conre",
+    "Vanne",
+    "Rossi",
+    "Dubois",
+    "Novak",
+    "Haddad",
+)
+HOBBIES = (
+    "badminton",
+    "tennis",
+    "classical music",
+    "rugby",
+    "watching tv",
+    "shopping",
+    "ballet",
+    "street dance",
+    "running",
+    "boxe",
+    "chess",
+    "cooking",
+    "hiking",
+)
+
+
+def generate_records(count: int, seed: int = 0) -> Iterator[PersonTypedDict]:
+    """Yield count deterministic employee records for the given seed.
+
+    Records are produced one at a time, so any number can be generated in
+    constant memory. The same seed always gives the same records.
+    """
+    rng = random.Random(seed)
+    for record_id in range(1, count + 1):
+        age = rng.randint(18, 90)
+        first_year = max(CURRENT_YEAR - age + 18, CURRENT_YEAR - 50)
+        span = range(first_year, CURRENT_YEAR + 1)
+        working_years = sorted(rng.sample(span, rng.randint(1, min(len(span), 10))))
+        note_years = sorted(
+            rng.sample(working_years, rng.randint(0, min(len(working_years), 3)))
+        )
+        notes: List[NoteTypedDict] = [
+            {
+                "year": year,
+                "working_months": rng.randint(1, 12),
+                "satisfied": rng.random() < 0.5,
+            }
+            for year in note_years
+        ]
+        yield {
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "age": age,
+            "id": record_id,
+            "salary": rng.randrange(1000, 9001, 100),
+            "working_years": working_years,
+            "is_working": rng.random() < 0.75,
+            "notes": notes,
+            "hobbies": rng.sample(HOBBIES, rng.randint(0, 3)),
+        }
+
+
+def write_dataset(path: str, fmt: str, count: int, seed: int = 0) -> None:
+    """Stream count generated records to path in one of the WRITERS formats."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        WRITERS[fmt](generate_records(count, seed), f)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic documents.* datasets of any size."
+    )
+    parser.add_argument("count", type=int, help="number of records to generate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--formats", nargs="+", choices=WRITERS, default=list(WRITERS))
+    parser.add_argument("--out-dir", default="data/generated")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    for fmt in args.formats:
+        path = os.path.join(args.out_dir, f"documents_{args.count}.{fmt}")
+        write_dataset(path, fmt, args.count, args.seed)
+        print(f"Wrote {args.count:,} records to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+import io
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+T = TypeVar("T")
+
+# Loader stages in pipeline order:
+#   read      file I/O and decompression, with the bytes delivered to the parser
+#   tokenize  the format's parser (csv.reader, iterparse, the YAML/JSON scanner)
+#   convert   raw rows to plain PersonTypedDict dicts
+#   validate  pydantic validation of those dicts
+#   build     the namedtuple, typeddict and slots model builders
+#   output    formatting and writing records in an EXPORTERS format
+STAGES = ("read", "tokenize", "convert", "validate", "build", "output")
+
+# Upper bounds in seconds of the per-item histogram buckets (the last is +Inf)
+HISTOGRAM_BOUNDS = (
+    1e-6,
+    2.5e-6,
+    5e-6,
+    1e-5,
+    2.5e-5,
+    5e-5,
+    1e-4,
+    2.5e-4,
+    1e-3,
+    1e-2,
+    1e-1,
+    1.0,
+)
+
+
+@dataclass(slots=True)
+class StageStats:
+    """Exclusive time, items and bytes of one stage."""
+
+    seconds: float = 0.0
+    items: int = 0
+    bytes: int = 0
+    # Items per HISTOGRAM_BOUNDS bucket plus +Inf, when histograms are kept
+    histogram: Optional[List[int]] = None
+
+    def observe(self, seconds: float) -> None:
+        self.seconds += seconds
+        self.items += 1
+        if self.histogram is not None:
+            self.histogram[bisect_left(HISTOGRAM_BOUNDS, seconds)] += 1
+
+
+@dataclass
+class Stats:
+    """Per-stage counters collected while instrumentation is enabled.
+
+    Stage times are exclusive: time a stage spends waiting on an inner
+    instrumented stage (e.g. tokenize pulling bytes from read) is counted
+    only by the inner one, so the stage times add up to the instrumented
+    part of the run. Items count what passed through a stage: blocks for
+    read, records for the others; output bytes are characters written.
+    Work done in worker processes is not collected.
+    """
+
+    histograms: bool = False
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+    # Inclusive time of instrumented calls so far, used to derive exclusive times
+    nested: float = 0.0
+
+    def stage(self, name: str) -> StageStats:
+        stats = self.stages.get(name)
+        if stats is None:
+            histogram = [0] * (len(HISTOGRAM_BOUNDS) + 1) if self.histograms else None
+            stats = self.stages[name] = StageStats(histogram=histogram)
+        return stats
+
+    def ordered(self) -> List[Tuple[str, StageStats]]:
+        """The stages in STAGES order, followed by any custom stages."""
+        order = {name: i for i, name in enumerate(STAGES)}
+        return sorted(self.stages.items(), key=lambda item: order.get(item[0], 99))
+
+    @property
+    def seconds(self) -> float:
+        return sum(stats.seconds for stats in self.stages.values())
+
+    def as_dict(self) -> Dict[str, Any]:
+        stages: Dict[str, Any] = {}
+        for name, stats in self.ordered():
+            entry: Dict[str, Any] = {
+                "seconds": stats.seconds,
+                "items": stats.items,
+                "bytes": stats.bytes,
+            }
+            if any(stats.histogram or ()):
+                entry["histogram"] = {
+                    "bounds": [*HISTOGRAM_BOUNDS, "+Inf"],
+                    "counts": stats.histogram,
+                }
+            stages[name] = entry
+        return {"seconds": self.seconds, "stages": stages}
+
+    def to_json(self) -> str:
+        import json
+
+        return json.dumps(self.as_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = "documents_loader") -> str:
+        """The counters in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric, kind, help_text, value in (
+            ("stage_seconds_total", "counter", "Exclusive time per stage.", "seconds"),
+            ("stage_items_total", "counter", "Items passed per stage.", "items"),
+            ("stage_bytes_total", "counter", "Bytes passed per stage.", "bytes"),
+        ):
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} {kind}")
+            for name, stats in self.ordered():
+                number = getattr(stats, value)
+                lines.append(f'{prefix}_{metric}{{stage="{name}"}} {number}')
+        # Stages timed as a whole (output) observe no single items
+        histograms = [(n, s) for n, s in self.ordered() if any(s.histogram or ())]
+        if histograms:
+            metric = f"{prefix}_stage_item_seconds"
+            lines.append(f"# HELP {metric} Exclusive time per item and stage.")
+            lines.append(f"# TYPE {metric} histogram")
+            for name, stats in histograms:
+                cumulative = 0
+                for bound, count in zip(
+                    (*HISTOGRAM_BOUNDS, "+Inf"), cast(List[int], stats.histogram)
+                ):
+                    cumulative += count
+                    lines.append(
+                        f'{metric}_bucket{{stage="{name}",le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f'{metric}_sum{{stage="{name}"}} {stats.seconds}')
+                lines.append(f'{metric}_count{{stage="{name}"}} {stats.items}')
+        return "\n".join(lines) + "\n"
+
+    def to_text(self) -> str:
+        """A table of the stages with their throughput and share of the time."""
+        total = self.seconds
+        lines = [
+            f"{'stage':<10} {'items':>10} {'bytes':>13} {'seconds':>9} "
+            f"{'items/s':>11} {'share':>6}"
+        ]
+        for name, stats in self.ordered():
+            rate = stats.items / stats.seconds if stats.seconds > 0 else 0
+            share = stats.seconds / total if total > 0 else 0
+            lines.append(
+                f"{name:<10} {stats.items:>10,} {stats.bytes:>13,} "
+                f"{stats.seconds:>9.3f} {rate:>11,.0f} {share:>6.1%}"
+            )
+        lines.append(f"{'total':<10} {'':>10} {'':>13} {total:>9.3f}")
+        return "\n".join(lines) + "\n"
+
+
+# The active collector; None (the default) turns every hook into a no-op
+STATS: Optional[Stats] = None
+
+STATS_FORMATS: Dict[str, Callable[[Stats], str]] = {
+    "text": Stats.to_text,
+    "json": lambda stats: stats.to_json() + "\n",
+    "prometheus": Stats.to_prometheus,
+}
+
+
+def enable(histograms: bool = False) -> Stats:
+    """Start collecting into a new Stats object and return it."""
+    global STATS
+    STATS = Stats(histograms=histograms)
+    return STATS
+
+
+def disable() -> Optional[Stats]:
+    """Stop collecting; returns what was collected."""
+    global STATS
+    stats, STATS = STATS, None
+    return stats
+
+
+# ==================== HOOKS ====================
+# Hooks are applied where a pipeline is assembled, not per record: while
+# STATS is None they return their argument unchanged, so a disabled run
+# pays one global lookup per file or export and nothing per record.
+def instrument(stage: str, items: Iterator[T]) -> Iterator[T]:
+    """Time producing each item of items as stage, when enabled."""
+    stats = STATS
+    if stats is None:
+        return items
+    return _timed_items(stats, stats.stage(stage), items)
+
+
+def _timed_items(stats: Stats, stage: StageStats, items: Iterator[T]) -> Iterator[T]:
+    clock = time.perf_counter
+    observe = stage.observe
+    while True:
+        nested = stats.nested
+        start = clock()
+        try:
+            item = next(items)
+        except StopIteration:
+            elapsed = clock() - start
+            stage.seconds += elapsed - (stats.nested - nested)
+            stats.nested = nested + elapsed
+            return
+        elapsed = clock() - start
+        observe(elapsed - (stats.nested - nested))
+        stats.nested = nested + elapsed
+        yield item
+
+
+@contextmanager
+def _timed_block(stats: Stats, stage: StageStats) -> Iterator[StageStats]:
+    nested = stats.nested
+    start = time.perf_counter()
+    try:
+        yield stage
+    finally:
+        elapsed = time.perf_counter() - start
+        stage.seconds += elapsed - (stats.nested - nested)
+        stats.nested = nested + elapsed
+
+
+def measure(stage: str) -> ContextManager[Optional[StageStats]]:
+    """Time a with block as stage, when enabled; yields the stage or None."""
+    stats = STATS
+    if stats is None:
+        return nullcontext()
+    return _timed_block(stats, stats.stage(stage))
+
+
+class _MeteredReader(io.RawIOBase):
+    """Raw reader timing and counting the reads of a wrapped binary file."""
+
+    def __init__(self, f: BinaryIO, stats: Stats):
+        self._f = f
+        self._stats = stats
+        self._stage = stats.stage("read")
+        self.name = getattr(f, "name", "")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        stats = self._stats
+        nested = stats.nested
+        start = time.perf_counter()
+        size = self._f.readinto(buffer)  # type: ignore[attr-defined]
+        elapsed = time.perf_counter() - start
+        self._stage.observe(elapsed - (stats.nested - nested))
+        self._stage.bytes += size or 0
+        stats.nested = nested + elapsed
+        return cast(int, size)
+
+
+# Metered files are read ahead in blocks this large, so timing adds one pair
+# of clock calls per block rather than per parser read
+METERED_BUFFER_SIZE = 256 * 1024
+
+
+def metered(f: BinaryIO) -> BinaryIO:
+    """Count the bytes read from f and their time as the read stage, when enabled.
+
+    Closing the returned reader leaves f open.
+    """
+    stats = STATS
+    if stats is None:
+        return f
+    reader = io.BufferedReader(_MeteredReader(f, stats), METERED_BUFFER_SIZE)
+    return cast(BinaryIO, reader)
+
+
+# ==================== TIMER ====================
+class Timer:
+    """Monotonic stopwatch: with Timer() as t: ...; then t.seconds."""
+
+    __slots__ = ("start", "seconds")
+
+    def __init__(self) -> None:
+        self.start = 0.0
+        self.seconds = 0.0
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.seconds = time.perf_counter() - self.start
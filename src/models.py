@@ -0,0 +1,525 @@
+import importlib
+import sys
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Tuple,
+    TypedDict,
+    cast,
+)
+
+from pipeline import MODELS, LazyBuilders
+
+if TYPE_CHECKING:
+    import xml.etree.ElementTree as ET
+
+
+# ==================== PYDANTIC MODEL ====================
+# FileNote, FileData, DataSchema and the batch validator live in
+# pydantic_models.py and are imported on first access, so that runs which
+# never build a pydantic model do not pay for importing pydantic.
+_PYDANTIC_NAMES = frozenset(
+    (
+        "FileNote",
+        "FileData",
+        "DataSchema",
+        "FILE_DATA_LIST",
+        "VALIDATION_BATCH_SIZE",
+        "validate_file_data",
+    )
+)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _PYDANTIC_NAMES:
+        return getattr(importlib.import_module("pydantic_models"), name)
+    if name == "MODEL_CLASSES":
+        return {name: model_class(name) for name in MODEL_NAMES}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ==================== NAMEDTUPLE ====================
+class Note(NamedTuple):
+    year: int
+    working_months: int
+    satisfied: bool
+
+
+class Person(NamedTuple):
+    name: str
+    age: int
+    id: int
+    salary: int
+    working_years: List[int]
+    is_working: bool
+    notes: List[Note]
+    hobbies: List[str]
+
+    @classmethod
+    def from_csv_row(cls, row: Dict[str, str]) -> "Person":
+        """Create Person from CSV row with proper parsing."""
+        return cls.from_dict(parse_csv_row_to_typeddict(row))
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Person":
+        """Create Person from dictionary with proper parsing."""
+        # Handle missing fields with defaults
+        notes_data = data.get("notes", [])
+        notes = [Note(**note) for note in notes_data]
+
+        hobbies = data.get("hobbies", [])
+
+        return cls(
+            name=data["name"],
+            age=data["age"],
+            id=data["id"],
+            salary=data["salary"],
+            working_years=data["working_years"],
+            is_working=data["is_working"],
+            notes=notes,
+            hobbies=hobbies,
+        )
+
+    @classmethod
+    def from_xml_element(cls, element: "ET.Element") -> "Person":
+        """Create Person from XML element with proper parsing."""
+        # Parse basic fields
+        name = element.findtext("name", "").strip()
+
+        # FIXED: All int conversions with null checks
+        age_text = element.findtext("age", "0")
+        age = int(age_text) if age_text is not None else 0
+
+        id_text = element.findtext("id", "0")
+        id_num = int(id_text) if id_text is not None else 0
+
+        salary_text = element.findtext("salary", "0")
+        salary = int(salary_text) if salary_text is not None else 0
+
+        is_working = element.findtext("is_working", "false").lower() == "true"
+
+        # Parse working_years
+        working_years_element = element.find("working_years")
+        working_years = (
+            [
+                int(year.text)
+                for year in working_years_element.findall("year")
+                if year.text is not None
+            ]
+            if working_years_element is not None
+            else []
+        )
+
+        # Parse notes
+        notes = []
+        notes_element = element.find("notes")
+        if notes_element is not None:
+            for note_element in notes_element.findall("note"):
+                # FIXED: All int conversions with null checks
+                year_text = note_element.findtext("year", "0")
+                months_text = note_element.findtext("working_months", "0")
+                satisfied_text = note_element.findtext("satisfied", "false")
+
+                note = Note(
+                    year=int(year_text) if year_text is not None else 0,
+                    working_months=int(months_text) if months_text is not None else 0,
+                    satisfied=satisfied_text.lower() == "true"
+                    if satisfied_text is not None
+                    else False,
+                )
+                notes.append(note)
+
+        # Parse hobbies
+        hobbies = []
+        hobbies_element = element.find("hobbies")
+        if hobbies_element is not None:
+            hobbies = [
+                hobby.text.strip()
+                for hobby in hobbies_element.findall("hobby")
+                if hobby.text is not None
+            ]
+
+        return cls(
+            name=name,
+            age=age,
+            id=id_num,
+            salary=salary,
+            working_years=working_years,
+            is_working=is_working,
+            notes=notes,
+            hobbies=hobbies,
+        )
+
+
+class Records(NamedTuple):
+    records: List[Person]
+
+
+# ==================== TYPEDDICT ====================
+class NoteTypedDict(TypedDict):
+    year: int
+    working_months: int
+    satisfied: bool
+
+
+class PersonTypedDict(TypedDict):
+    name: str
+    age: int
+    id: int
+    salary: int
+    working_years: List[int]
+    is_working: bool
+    notes: List[NoteTypedDict]
+    hobbies: List[str]
+
+
+class RecordsTypedDict(TypedDict):
+    records: List[PersonTypedDict]
+
+
+# Columns every CSV file must have, and the optional ones that default to empty
+CSV_REQUIRED_COLUMNS = ("name", "age", "id", "salary", "is_working")
+CSV_OPTIONAL_COLUMNS = (
+    "working_years",
+    "notes_year",
+    "notes_working_months",
+    "notes_satisfied",
+    "hobbies",
+)
+
+
+@lru_cache(maxsize=None)
+def compile_csv_row_decoder(
+    header: Tuple[str, ...],
+) -> Callable[[List[str]], PersonTypedDict]:
+    """Build a decoder turning csv.reader rows with this header into records.
+
+    Column positions are resolved once, so decoding a row is a single
+    itemgetter call plus one split per list column, with no dict per row.
+    Missing optional columns (and short rows) decode as empty values;
+    fields beyond the header are ignored.
+    """
+    missing = [name for name in CSV_REQUIRED_COLUMNS if name not in header]
+    if missing:
+        raise ValueError(f"CSV header lacks the columns {', '.join(missing)}")
+    width = len(header)
+    # Absent optional columns read the "" that short rows are padded with
+    positions = {name: i for i, name in enumerate(header)}
+    columns = itemgetter(
+        *(positions.get(name, width) for name in CSV_REQUIRED_COLUMNS),
+        *(positions.get(name, width) for name in CSV_OPTIONAL_COLUMNS),
+    )
+    padding = [""] * (width + 1)
+
+    def decode(row: List[str]) -> PersonTypedDict:
+        if len(row) <= width:
+            row = row + padding[len(row) :]
+        else:
+            # Fields beyond the header are ignored, as csv.DictReader does
+            row = row[:width] + padding[width:]
+        (
+            name,
+            age,
+            id_,
+            salary,
+            is_working,
+            working_years,
+            notes_year,
+            notes_months,
+            notes_satisfied,
+            hobbies,
+        ) = columns(row)
+        working_years = working_years.strip('"')
+        hobbies = hobbies.strip('"')
+        notes: List[NoteTypedDict] = []
+        if notes_year:
+            # Notes are three parallel ";" lists; entries without a year are
+            # gaps, and lists of different lengths are malformed rows
+            for year, months, satisfied in zip(
+                notes_year.split(";"),
+                notes_months.split(";"),
+                notes_satisfied.lower().split(";"),
+                strict=True,
+            ):
+                if year:
+                    notes.append(
+                        {
+                            "year": int(year),
+                            "working_months": int(months),
+                            "satisfied": satisfied.strip() == "true",
+                        }
+                    )
+        return {
+            "name": name.strip('"'),
+            "age": int(age),
+            "id": int(id_),
+            "salary": int(salary),
+            "working_years": (
+                list(map(int, working_years.split(","))) if working_years else []
+            ),
+            "is_working": is_working.lower() == "true",
+            "notes": notes,
+            "hobbies": (
+                [hobby.strip() for hobby in hobbies.split(",")] if hobbies else []
+            ),
+        }
+
+    return decode
+
+
+def parse_csv_row_to_typeddict(row: Dict[str, str]) -> PersonTypedDict:
+    """Parse CSV row to TypedDict with proper data types."""
+    return compile_csv_row_decoder(tuple(row))(list(row.values()))
+
+
+def parse_dict_to_typeddict(data: Dict[str, Any]) -> PersonTypedDict:
+    """Parse dictionary to TypedDict with proper data types."""
+    # Handle missing fields with defaults
+    notes_data = data.get("notes", [])
+    notes: List[NoteTypedDict] = [
+        {
+            "year": note["year"],
+            "working_months": note["working_months"],
+            "satisfied": note["satisfied"],
+        }
+        for note in notes_data
+    ]
+
+    hobbies = data.get("hobbies", [])
+
+    return {
+        "name": data["name"],
+        "age": data["age"],
+        "id": data["id"],
+        "salary": data["salary"],
+        "working_years": data["working_years"],
+        "is_working": data["is_working"],
+        "notes": notes,
+        "hobbies": hobbies,
+    }
+
+
+def parse_xml_element_to_typeddict(element: "ET.Element") -> PersonTypedDict:
+    """Parse XML element to TypedDict with proper data types."""
+    # Parse basic fields
+    name = element.findtext("name", "").strip()
+
+    # FIXED: All int conversions with null checks
+    age_text = element.findtext("age", "0")
+    age = int(age_text) if age_text is not None else 0
+
+    id_text = element.findtext("id", "0")
+    id_num = int(id_text) if id_text is not None else 0
+
+    salary_text = element.findtext("salary", "0")
+    salary = int(salary_text) if salary_text is not None else 0
+
+    is_working = element.findtext("is_working", "false").lower() == "true"
+
+    # Parse working_years
+    working_years_element = element.find("working_years")
+    working_years = (
+        [
+            int(year.text)
+            for year in working_years_element.findall("year")
+            if year.text is not None
+        ]
+        if working_years_element is not None
+        else []
+    )
+
+    # Parse notes
+    notes: List[NoteTypedDict] = []
+    notes_element = element.find("notes")
+    if notes_element is not None:
+        for note_element in notes_element.findall("note"):
+            # FIXED: All int conversions with null checks
+            year_text = note_element.findtext("year", "0")
+            months_text = note_element.findtext("working_months", "0")
+            satisfied_text = note_element.findtext("satisfied", "false")
+
+            note: NoteTypedDict = {
+                "year": int(year_text) if year_text is not None else 0,
+                "working_months": int(months_text) if months_text is not None else 0,
+                "satisfied": satisfied_text.lower() == "true"
+                if satisfied_text is not None
+                else False,
+            }
+            notes.append(note)
+
+    # Parse hobbies
+    hobbies = []
+    hobbies_element = element.find("hobbies")
+    if hobbies_element is not None:
+        hobbies = [
+            hobby.text.strip()
+            for hobby in hobbies_element.findall("hobby")
+            if hobby.text is not None
+        ]
+
+    return {
+        "name": name,
+        "age": age,
+        "id": id_num,
+        "salary": salary,
+        "working_years": working_years,
+        "is_working": is_working,
+        "notes": notes,
+        "hobbies": hobbies,
+    }
+
+
+# ==================== SLOTS ====================
+@dataclass(slots=True)
+class CompactNote:
+    year: int
+    working_months: int
+    satisfied: bool
+
+
+@dataclass(slots=True)
+class CompactPerson:
+    """Person with __slots__ and its integer lists packed into arrays.
+
+    working_years is an array('h') of 2-byte values instead of a list of
+    boxed ints, and all notes share one flat array('h') of
+    (year, working_months, satisfied) triples that the notes property unpacks.
+    """
+
+    name: str
+    age: int
+    id: int
+    salary: int
+    working_years: "array[int]"
+    is_working: bool
+    note_values: "array[int]"
+    hobbies: List[str]
+
+    @property
+    def notes(self) -> List[CompactNote]:
+        values = self.note_values
+        return [
+            CompactNote(values[i], values[i + 1], bool(values[i + 2]))
+            for i in range(0, len(values), 3)
+        ]
+
+    @classmethod
+    def from_typeddict(cls, data: PersonTypedDict) -> "CompactPerson":
+        """Pack a parsed PersonTypedDict record."""
+        note_values = array("h")
+        for note in data["notes"]:
+            note_values.extend(
+                (note["year"], note["working_months"], note["satisfied"])
+            )
+        return cls(
+            name=data["name"],
+            age=data["age"],
+            id=data["id"],
+            salary=data["salary"],
+            working_years=array("h", data["working_years"]),
+            is_working=data["is_working"],
+            note_values=note_values,
+            hobbies=data["hobbies"],
+        )
+
+    @classmethod
+    def from_csv_row(cls, row: Dict[str, str]) -> "CompactPerson":
+        """Create CompactPerson from CSV row with proper parsing."""
+        return cls.from_typeddict(parse_csv_row_to_typeddict(row))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompactPerson":
+        """Create CompactPerson from dictionary with proper parsing."""
+        return cls.from_typeddict(parse_dict_to_typeddict(data))
+
+    @classmethod
+    def from_xml_element(cls, element: "ET.Element") -> "CompactPerson":
+        """Create CompactPerson from XML element with proper parsing."""
+        return cls.from_typeddict(parse_xml_element_to_typeddict(element))
+
+
+@dataclass(slots=True)
+class CompactRecords:
+    records: List[CompactPerson]
+
+
+# ==================== MODEL SELECTION ====================
+# MODEL_CLASSES (a dict from these names to the model classes) is built on
+# access by __getattr__, since its pydantic entry imports pydantic
+MODEL_NAMES = MODELS
+_MODEL_CLASSES: Dict[str, Any] = {
+    "namedtuple": Person,
+    "typeddict": PersonTypedDict,
+    "slots": CompactPerson,
+}
+
+# Builders turning a parsed PersonTypedDict row into each model; shared by the
+# readers whose rows are already typed (decoded CSV, the cache, record files)
+TYPEDDICT_BUILDERS = LazyBuilders(
+    {
+        "pydantic": "pydantic_models:FileData.model_validate",
+        "namedtuple": Person.from_dict,
+        "typeddict": parse_dict_to_typeddict,
+        "slots": CompactPerson.from_typeddict,
+    }
+)
+
+
+def model_class(name: str) -> Any:
+    """Return the model class of a MODEL_NAMES name."""
+    if name == "pydantic":
+        return importlib.import_module("pydantic_models").FileData
+    try:
+        return _MODEL_CLASSES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown model {name!r}; choose from {', '.join(MODEL_NAMES)}"
+        ) from None
+
+
+def model_name(model: Any) -> str:
+    """Return the MODEL_NAMES name of a record model class, or of a name."""
+    if isinstance(model, str):
+        if model not in MODEL_NAMES:
+            model_class(model)  # raises for unknown names
+        return model
+    for name, known in _MODEL_CLASSES.items():
+        if model is known:
+            return name
+    # FileData can only be passed in once pydantic_models has been imported
+    pydantic_models = sys.modules.get("pydantic_models")
+    if pydantic_models is not None and model is pydantic_models.FileData:
+        return "pydantic"
+    raise ValueError(f"Unsupported record model: {model!r}")
+
+
+def record_to_typeddict(record: Any) -> PersonTypedDict:
+    """Plain PersonTypedDict form of a record of any MODEL_CLASSES model."""
+    if isinstance(record, dict):
+        return cast(PersonTypedDict, record)
+    return {
+        "name": record.name,
+        "age": record.age,
+        "id": record.id,
+        "salary": record.salary,
+        "working_years": list(record.working_years),
+        "is_working": record.is_working,
+        "notes": [
+            {
+                "year": note.year,
+                "working_months": note.working_months,
+                "satisfied": note.satisfied,
+            }
+            for note in record.notes
+        ],
+        "hobbies": record.hobbies,
+    }
@@ -0,0 +1,318 @@
+import argparse
+import time
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from models import CSV_OPTIONAL_COLUMNS, CSV_REQUIRED_COLUMNS
+from record_table import IntArray
+
+CSV_PATH = "data/documents.csv"
+
+# read_csv engines: "c" is pandas' own parser, "pyarrow" parses with
+# multiple threads but needs the optional pyarrow package and cannot stream
+Engine = Literal["c", "pyarrow"]
+ENGINES: Tuple[Engine, ...] = ("c", "pyarrow")
+DEFAULT_CHUNKSIZE = 100_000
+
+# Explicit column types; nothing is inferred. Integers are read as int64,
+# since read_csv wraps values that overflow a narrower dtype, and narrowed
+# to the RecordTable column types afterwards where the values fit
+CSV_DTYPES: Dict[str, str] = {
+    "name": "object",
+    "age": "int64",
+    "id": "int64",
+    "salary": "int64",
+    "is_working": "bool",
+    **{column: "object" for column in CSV_OPTIONAL_COLUMNS},
+}
+PEOPLE_COLUMNS = ["id", "name", "age", "salary", "is_working"]
+NARROW_DTYPES = {"age": "int16"}
+
+
+class DocumentFrames(NamedTuple):
+    """documents.csv as one frame per entity, joined on the "id" column.
+
+    people holds the scalar fields, one row per record; the list columns
+    become child frames with one row per list entry, in record order.
+    """
+
+    people: pd.DataFrame  # id, name, age, salary, is_working
+    working_years: pd.DataFrame  # id, year
+    notes: pd.DataFrame  # id, year, working_months, satisfied
+    hobbies: pd.DataFrame  # id, hobby (categorical)
+
+
+def _check_engine(engine: Engine) -> None:
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}; choose from {', '.join(ENGINES)}")
+
+
+def _known_column(column: str) -> bool:
+    return column in CSV_DTYPES
+
+
+def _narrow(values: npt.NDArray[Any], dtype: str) -> npt.NDArray[Any]:
+    """values cast to dtype when they all fit, else left as int64.
+
+    A plain cast would wrap out-of-range values around; keeping them wide
+    preserves the true values, as the row-by-row CSV decoder does.
+    """
+    info = np.iinfo(dtype)
+    if len(values) and (values.min() < info.min or values.max() > info.max):
+        return values
+    return values.astype(dtype)
+
+
+def _complete(frame: pd.DataFrame) -> pd.DataFrame:
+    """Check the required columns and add missing optional ones as empty."""
+    missing = [name for name in CSV_REQUIRED_COLUMNS if name not in frame.columns]
+    if missing:
+        raise ValueError(f"CSV header lacks the columns {', '.join(missing)}")
+    for column in CSV_OPTIONAL_COLUMNS:
+        if column not in frame.columns:
+            frame[column] = ""
+        elif frame[column].hasnans:  # pyarrow reads empty fields as null
+            frame[column] = frame[column].fillna("")
+    for column, dtype in NARROW_DTYPES.items():
+        frame[column] = _narrow(frame[column].to_numpy(), dtype)
+    return frame
+
+
+def read_csv_frame(path: str = CSV_PATH, engine: Engine = "c") -> pd.DataFrame:
+    """Read a documents.csv file into one typed DataFrame.
+
+    The list columns (working_years, notes_*, hobbies) stay strings; see
+    split_list_columns for their exploded form.
+    """
+    _check_engine(engine)
+    frame = pd.read_csv(
+        path,
+        engine=engine,
+        usecols=_known_column,
+        dtype=CSV_DTYPES,
+        keep_default_na=False,  # empty list cells stay "" instead of NaN
+        na_filter=engine == "pyarrow",  # the C engine can skip NaN detection
+    )
+    return _complete(frame)
+
+
+def iter_csv_frames(
+    path: str = CSV_PATH, chunksize: int = DEFAULT_CHUNKSIZE
+) -> Iterator[pd.DataFrame]:
+    """Stream a documents.csv file as typed DataFrames of chunksize rows.
+
+    Only one chunk is parsed and held at a time, so files of any size can be
+    processed in bounded memory. Streaming needs the C engine.
+    """
+    with pd.read_csv(
+        path,
+        usecols=_known_column,
+        dtype=CSV_DTYPES,
+        keep_default_na=False,
+        na_filter=False,
+        chunksize=chunksize,
+    ) as chunks:
+        for chunk in chunks:
+            yield _complete(chunk)
+
+
+def _explode(frame: pd.DataFrame, columns: List[str], sep: str) -> pd.DataFrame:
+    """One row per list entry of columns, which are split on sep in parallel."""
+    parts = frame[["id"]].assign(
+        **{column: frame[column].str.split(sep) for column in columns}
+    )
+    exploded = parts.explode(columns, ignore_index=True)
+    # An empty cell explodes to one "" entry; entries without a first value
+    # are gaps, as in the row-by-row CSV decoder
+    return exploded[exploded[columns[0]].str.strip() != ""].reset_index(drop=True)
+
+
+def _list_lengths(column: "pd.Series[str]", sep: str) -> IntArray:
+    """Entries per cell of a sep-separated list column; empty cells have none."""
+    lengths = cast(IntArray, column.str.count(sep).to_numpy(np.int64) + 1)
+    lengths[(column == "").to_numpy()] = 0
+    return lengths
+
+
+def _parse_numbers(
+    column: "pd.Series[str]", sep: str, dtype: str, count: int
+) -> Optional[npt.NDArray[Any]]:
+    """All entries of a numeric list column, parsed by NumPy in one call.
+
+    The entries are parsed as int64 and narrowed to dtype where they fit.
+    Returns None when the column holds anything but count integers (gaps,
+    text), so the caller can fall back to the exploding path.
+    """
+    text = sep.join(column[column != ""].tolist())
+    entries = text.split(sep) if text else []
+    if len(entries) != count:
+        return None
+    try:
+        values = np.array(entries, dtype=np.int64)
+    except (ValueError, OverflowError):
+        return None
+    return _narrow(values, dtype)
+
+
+def _parse_exploded(entries: "pd.Series[str]", dtype: str) -> npt.NDArray[Any]:
+    """Exploded list entries as integers, narrowed to dtype where they fit."""
+    return _narrow(entries.astype("int64").to_numpy(), dtype)
+
+
+def _years_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    lengths = _list_lengths(frame["working_years"], ",")
+    years = _parse_numbers(frame["working_years"], ",", "int16", int(lengths.sum()))
+    if years is None:
+        exploded = _explode(frame, ["working_years"], ",")
+        return pd.DataFrame(
+            {
+                "id": exploded["id"],
+                "year": _parse_exploded(exploded["working_years"], "int16"),
+            }
+        )
+    return pd.DataFrame(
+        {"id": np.repeat(frame["id"].to_numpy(), lengths), "year": years}
+    )
+
+
+def _notes_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    lengths = _list_lengths(frame["notes_year"], ";")
+    count = int(lengths.sum())
+    # true/false become 1/0 so the flags parse like the numbers
+    satisfied_text = (
+        frame["notes_satisfied"]
+        .str.lower()
+        .str.replace("true", "1")
+        .str.replace("false", "0")
+    )
+    columns = (
+        _parse_numbers(frame["notes_year"], ";", "int16", count),
+        _parse_numbers(frame["notes_working_months"], ";", "uint8", count),
+        _parse_numbers(satisfied_text, ";", "int8", count),
+    )
+    aligned = all(
+        np.array_equal(_list_lengths(frame[name], ";"), lengths)
+        for name in ("notes_working_months", "notes_satisfied")
+    )
+    if aligned and all(values is not None for values in columns):
+        year, months, satisfied = columns
+        return pd.DataFrame(
+            {
+                "id": np.repeat(frame["id"].to_numpy(), lengths),
+                "year": year,
+                "working_months": months,
+                "satisfied": cast(npt.NDArray[np.int8], satisfied).astype(bool),
+            }
+        )
+    # Gaps or ragged note lists: split cell by cell like the CSV decoder
+    note_columns = ["notes_year", "notes_working_months", "notes_satisfied"]
+    raw = _explode(frame.assign(notes_satisfied=satisfied_text), note_columns, ";")
+    return pd.DataFrame(
+        {
+            "id": raw["id"],
+            "year": _parse_exploded(raw["notes_year"], "int16"),
+            "working_months": _parse_exploded(raw["notes_working_months"], "uint8"),
+            "satisfied": raw["notes_satisfied"].str.strip() == "1",
+        }
+    )
+
+
+def _hobbies_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    column = frame["hobbies"]
+    lengths = _list_lengths(column, ",")
+    hobbies = pd.Series(",".join(column[column != ""].tolist()).split(","))
+    if not lengths.any():
+        hobbies = hobbies.iloc[:0]  # "".split(",") is [""]
+    return pd.DataFrame(
+        {
+            "id": np.repeat(frame["id"].to_numpy(), lengths),
+            "hobby": hobbies.str.strip().astype("category"),
+        }
+    )
+
+
+def split_list_columns(frame: pd.DataFrame) -> DocumentFrames:
+    """Explode the list columns of a read_csv_frame frame into child frames.
+
+    Each list column is joined into one string and split or parsed by NumPy
+    in a single call, with the owning ids repeated by the per-cell entry
+    counts, so no step loops over the rows in Python.
+    """
+    people = frame[PEOPLE_COLUMNS].reset_index(drop=True)
+    return DocumentFrames(
+        people, _years_frame(frame), _notes_frame(frame), _hobbies_frame(frame)
+    )
+
+
+def iter_document_frames(
+    path: str = CSV_PATH, chunksize: int = DEFAULT_CHUNKSIZE
+) -> Iterator[DocumentFrames]:
+    """Stream a documents.csv file as DocumentFrames of chunksize records each."""
+    for chunk in iter_csv_frames(path, chunksize):
+        yield split_list_columns(chunk)
+
+
+def load_document_frames(
+    path: str = CSV_PATH, engine: Engine = "c", chunksize: Optional[int] = None
+) -> DocumentFrames:
+    """Load a whole documents.csv file as DocumentFrames.
+
+    With chunksize, the file is parsed and exploded chunk by chunk and the
+    results are concatenated, so the intermediate string lists of only one
+    chunk are alive at a time.
+    """
+    if chunksize is None:
+        return split_list_columns(read_csv_frame(path, engine))
+    if engine != "c":
+        raise ValueError("chunksize needs the c engine")
+    parts = list(iter_document_frames(path, chunksize))
+    if not parts:
+        return split_list_columns(read_csv_frame(path, engine))
+    frames = [
+        pd.concat([getattr(part, name) for part in parts], ignore_index=True)
+        for name in DocumentFrames._fields
+    ]
+    # Concatenating categoricals with different categories falls back to object
+    frames[3]["hobby"] = frames[3]["hobby"].astype("category")
+    return DocumentFrames(*frames)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Load documents.csv into typed pandas frames."
+    )
+    parser.add_argument("path", nargs="?", default=CSV_PATH)
+    parser.add_argument("--engine", choices=ENGINES, default="c")
+    parser.add_argument(
+        "--chunksize", type=int, help="parse and explode this many rows at a time"
+    )
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        frames = load_document_frames(args.path, args.engine, args.chunksize)
+    except (ImportError, ValueError) as error:
+        parser.exit(1, f"{parser.prog}: error: {error}\n")
+    elapsed = time.perf_counter() - start
+    print(f"Loaded {len(frames.people):,} records in {elapsed:.3f} s")
+    for name, frame in zip(DocumentFrames._fields, frames):
+        size = frame.memory_usage(deep=True).sum() / 2**20
+        print(f"{name:<14} {len(frame):>12,} rows {size:>10,.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
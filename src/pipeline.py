@@ -0,0 +1,78 @@
+import importlib
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Sequence,
+    Union,
+    cast,
+)
+
+from instrumentation import instrument, measure
+
+# Model representations every process_* module can build, in print order
+MODELS = ("pydantic", "namedtuple", "typeddict", "slots")
+
+
+class LazyBuilders(Mapping[str, Callable[[Any], Any]]):
+    """Builder mapping whose entries may name a callable instead of holding it.
+
+    A "module:attribute.path" entry is imported the first time it is looked
+    up, so a model with heavy dependencies (pydantic) costs nothing at import
+    time or in runs that never select it.
+    """
+
+    def __init__(self, builders: Mapping[str, Union[str, Callable[[Any], Any]]]):
+        self._builders = dict(builders)
+
+    def __getitem__(self, model: str) -> Callable[[Any], Any]:
+        builder = self._builders[model]
+        if not isinstance(builder, str):
+            return builder
+        module, _, path = builder.partition(":")
+        target: Any = importlib.import_module(module)
+        for attribute in path.split("."):
+            target = getattr(target, attribute)
+        self._builders[model] = target
+        return cast(Callable[[Any], Any], target)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._builders)
+
+    def __len__(self) -> int:
+        return len(self._builders)
+
+
+def select_builders(
+    builders: Mapping[str, Callable[[Any], Any]], models: Sequence[str]
+) -> Dict[str, Callable[[Any], Any]]:
+    """Keep only the builders for the requested models."""
+    unknown = [model for model in models if model not in builders]
+    if unknown:
+        raise ValueError(
+            f"Unknown model(s) {', '.join(unknown)}; choose from {', '.join(builders)}"
+        )
+    return {model: builders[model] for model in builders if model in models}
+
+
+def fan_out(
+    rows: Iterable[Any], builders: Mapping[str, Callable[[Any], Any]]
+) -> Dict[str, List[Any]]:
+    """Parse the source once and hand each raw row to every model builder.
+
+    Each row is converted into all requested models while it is still in
+    memory, so the data file is read and tokenized only once per run.
+    """
+    results: Dict[str, List[Any]] = {model: [] for model in builders}
+    targets = [(build, results[model].append) for model, build in builders.items()]
+    with measure("build") as stage:
+        for row in instrument("tokenize", iter(rows)):
+            for build, append in targets:
+                append(build(row))
+        if stage is not None:
+            stage.items += sum(map(len, results.values()))
+    return results
@@ -1,14 +1,33 @@
-import pandas as pd
-
-# Load CSV into pandas DataFrame
-df = pd.read_csv("data/documents.csv")
-
-# Print the DataFrame content
-print("=== PANDAS DATAFRAME CONTENT ===")
-print(df)
-print("\n=== FIRST 5 ROWS ===")
-print(df.head())
-print("\n=== COLUMNS AND DATA TYPES ===")
-print(df.dtypes)
-print("\n=== BASIC STATISTICS ===")  # for numerical columns
-print(df.describe())
+CSV_PATH = "data/documents.csv"
+
+
+def main(path: str = CSV_PATH) -> None:
+    """Print a CSV file as typed pandas DataFrames with dtypes and statistics."""
+    # Imported here so that importing this module stays cheap
+    from pandas_loader import read_csv_frame, split_list_columns
+
+    # Load CSV into a DataFrame with explicit dtypes
+    df = read_csv_frame(path)
+
+    # Print the DataFrame content
+    print("=== PANDAS DATAFRAME CONTENT ===")
+    print(df)
+    print("\n=== FIRST 5 ROWS ===")
+    print(df.head())
+    print("\n=== COLUMNS AND DATA TYPES ===")
+    print(df.dtypes)
+    print("\n=== BASIC STATISTICS ===")  # for numerical columns
+    print(df.describe())
+
+    # The list columns as child frames, one row per entry
+    frames = split_list_columns(df)
+    print("\n=== WORKING YEARS ===")
+    print(frames.working_years)
+    print("\n=== NOTES ===")
+    print(frames.notes)
+    print("\n=== HOBBIES ===")
+    print(frames.hobbies)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,165 +1,159 @@
 import json
-from typing import Any, Dict, List, NamedTuple, TypedDict
-
-import pydantic
-
-# Load JSON data
-with open("data/documents.json", "r") as f:
-    d = json.load(f)
+import sys
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Sequence,
+    TextIO,
+    Type,
+    overload,
+)
+
+from models import (
+    CompactPerson,
+    CompactRecords,
+    NoteTypedDict,
+    Person,
+    PersonTypedDict,
+    Records,
+    RecordsTypedDict,
+    parse_dict_to_typeddict,
+)
+from pipeline import MODELS, LazyBuilders, fan_out, select_builders
+from readers import Source, build_records, open_text_source, register_reader
+from writers import write_details, write_text
+
+if TYPE_CHECKING:
+    from pydantic_models import DataSchema, FileData
+
+JSON_PATH = "data/documents.json"
+_CHUNK_SIZE = 64 * 1024
+
+
+# Incremental reader
+class _JSONScanner:
+    """Decode JSON values one at a time from a text stream.
+
+    Only the value currently being decoded (plus one read chunk) is buffered.
+    """
+
+    def __init__(self, f: TextIO) -> None:
+        self._f = f
+        self._buf = ""
+        self._pos = 0
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        chunk = self._f.read(_CHUNK_SIZE)
+        if not chunk:
+            return False
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or "" at end of file."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return obj
+
+
+def iter_json_record_dicts(path: Source = JSON_PATH) -> Iterator[Dict[str, Any]]:
+    """Yield the items of the top-level "records" array one dict at a time."""
+    with open_text_source(path) as f:
+        scanner = _JSONScanner(f)
+        scanner.expect("{")
+        if scanner.peek() == "}":
+            return
+        while True:
+            key = scanner.value()
+            scanner.expect(":")
+            if key == "records":
+                scanner.expect("[")
+                if scanner.peek() != "]":
+                    while True:
+                        yield scanner.value()
+                        if scanner.peek() != ",":
+                            break
+                        scanner.expect(",")
+                scanner.expect("]")
+            else:
+                scanner.value()  # unrelated top-level value, skip it
+            if scanner.peek() != ",":
+                break
+            scanner.expect(",")
+        scanner.expect("}")
 
 
 # Pydantic Model
-class Filenotes(pydantic.BaseModel):
-    year: int
-    working_months: int
-    satisfied: bool
-
-
-class FileData(pydantic.BaseModel):
-    name: str
-    age: int
-    id: int
-    salary: int
-    working_years: list[int]
-    is_working: bool
-    notes: list[Filenotes] = pydantic.Field(default_factory=list)
-    hobbies: list[str] = pydantic.Field(default_factory=list)
-
+def load_and_process_pydantic(path: str = JSON_PATH) -> "DataSchema":
+    """Load JSON data and validate it with Pydantic.
 
-class DataSchema(pydantic.BaseModel):
-    records: list[FileData]
+    The raw bytes go straight to pydantic-core, which skips building the
+    intermediate dicts. That is about twice as fast as streaming but holds
+    the whole file in memory; use iter_json_records for very large files.
+    """
+    from pydantic_models import DataSchema
 
+    with open(path, "rb") as f:
+        return DataSchema.model_validate_json(f.read())
 
-# Process with Pydantic
-print("=== PYDANTIC DATA PROCESSING ===")
-model = DataSchema(records=d["records"])
 
-for record in model.records:
-    print(f"Name: {record.name}")
-    print(f"Age: {record.age}")
-    print(f"ID: {record.id}")
-    print(f"Salary: {record.salary}")
-    print(f"Working Years: {record.working_years}")
-    print(f"Notes: {record.notes}")
-    print(f"Hobbies: {record.hobbies}")
-    print("-" * 40)
+def print_pydantic_information(data: "DataSchema") -> None:
+    """Print all information from the Pydantic structure."""
+    print("=== PYDANTIC DATA PROCESSING ===")
+    write_text(data.records, sys.stdout)
 
 
 # NamedTuple Structure
-class Note(NamedTuple):
-    year: int
-    working_months: int
-    satisfied: bool
-
-
-class Person(NamedTuple):
-    name: str
-    age: int
-    id: int
-    salary: int
-    working_years: List[int]
-    is_working: bool
-    notes: List[Note]
-    hobbies: List[str]
-
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "Person":
-        """Create Person from dictionary with missing field handling."""
-        notes = [Note(**note) for note in data.get("notes", [])]
-        hobbies = data.get("hobbies", [])
-
-        return cls(
-            name=data["name"],
-            age=data["age"],
-            id=data["id"],
-            salary=data["salary"],
-            working_years=data["working_years"],
-            is_working=data["is_working"],
-            notes=notes,
-            hobbies=hobbies,
-        )
-
-
-class Records(NamedTuple):
-    records: List[Person]
-
-
-def load_and_process_namedtuple() -> Records:
+def load_and_process_namedtuple(path: str = JSON_PATH) -> Records:
     """Load JSON data and convert to NamedTuple structure."""
-    with open("data/documents.json", "r") as f:
-        json_data = json.load(f)
-
-    persons = [Person.from_dict(record) for record in json_data["records"]]
+    persons = list(iter_json_records(path, Person))
     return Records(records=persons)
 
 
 def print_all_information(data: Records) -> None:
     """Print all information from the data structure."""
     print("\n=== NAMEDTUPLE DATA PROCESSING ===")
-    for person in data.records:
-        print(f"\n--- Person ID: {person.id} ---")
-        print(f"Name: {person.name}")
-        print(f"Age: {person.age}")
-        print(f"Salary: ${person.salary}")
-        print(f"Currently Working: {person.is_working}")
-        print(f"Working Years: {person.working_years}")
-
-        print("Notes:")
-        if person.notes:
-            for note in person.notes:
-                status = "Satisfied" if note.satisfied else "Not Satisfied"
-                print(
-                    f"  - Year: {note.year}, "
-                    f"Months: {note.working_months}, "
-                    f"Status: {status}"
-                )
-        else:
-            print("  No notes available")
-
-        print("Hobbies:")
-        if person.hobbies:
-            for hobby in person.hobbies:
-                print(f"  - {hobby}")
-        else:
-            print("  No hobbies listed")
-
-        print("-" * 40)
-
-
-# Process with NamedTuple
-named_tuple_data = load_and_process_namedtuple()
-print_all_information(named_tuple_data)
+    write_details(data.records, sys.stdout)
 
 
 # TypedDict structure
 
 
-class NoteTypedDict(TypedDict):
-    year: int
-    working_months: int
-    satisfied: bool
-
-
-class PersonTypedDict(TypedDict):
-    name: str
-    age: int
-    id: int
-    salary: int
-    working_years: List[int]
-    is_working: bool
-    notes: List[NoteTypedDict]
-    hobbies: List[str]
-
-
-class RecordsTypedDict(TypedDict):
-    records: List[PersonTypedDict]
-
-
-def load_and_process_typeddict() -> RecordsTypedDict:
+def load_and_process_typeddict(path: str = JSON_PATH) -> RecordsTypedDict:
     """Load JSON data with TypedDict structure."""
-    with open("data/documents.json", "r") as f:
-        json_data: RecordsTypedDict = json.load(f)
-    return json_data
+    records = list(iter_json_records(path, PersonTypedDict))
+    return {"records": records}
 
 
 def safe_get_notes(person: PersonTypedDict) -> List[NoteTypedDict]:
@@ -175,38 +169,92 @@ def safe_get_hobbies(person: PersonTypedDict) -> List[str]:
 def print_typeddict_information(data: RecordsTypedDict) -> None:
     """Print all information from the TypedDict structure."""
     print("\n=== TYPEDDICT DATA PROCESSING ===")
-    for person in data["records"]:
-        print(f"\n--- Person ID: {person['id']} ---")
-        print(f"Name: {person['name']}")
-        print(f"Age: {person['age']}")
-        print(f"Salary: ${person['salary']}")
-        print(f"Currently Working: {person['is_working']}")
-        print(f"Working Years: {person['working_years']}")
-
-        notes = safe_get_notes(person)
-        print("Notes:")
-        if notes:
-            for note in notes:
-                status = "Satisfied" if note["satisfied"] else "Not Satisfied"
-                print(
-                    f"  - Year: {note['year']}, "
-                    f"Months: {note['working_months']}, "
-                    f"Status: {status}"
-                )
-        else:
-            print("  No notes available")
-
-        hobbies = safe_get_hobbies(person)
-        print("Hobbies:")
-        if hobbies:
-            for hobby in hobbies:
-                print(f"  - {hobby}")
-        else:
-            print("  No hobbies listed")
-
-        print("-" * 40)
-
-
-# Process with TypedDict
-typeddict_data = load_and_process_typeddict()
-print_typeddict_information(typeddict_data)
+    write_details(data["records"], sys.stdout)
+
+
+# Slots structure
+def load_and_process_slots(path: str = JSON_PATH) -> CompactRecords:
+    """Load JSON data into compact __slots__ records."""
+    persons = list(iter_json_records(path, CompactPerson))
+    return CompactRecords(records=persons)
+
+
+def print_slots_information(data: CompactRecords) -> None:
+    """Print all information from the slots structure."""
+    print("\n=== SLOTS DATA PROCESSING ===")
+    write_details(data.records, sys.stdout)
+
+
+# Streaming
+@overload
+def iter_json_records(
+    path: str = ..., model: "Type[FileData]" = ...
+) -> "Iterator[FileData]": ...
+
+
+@overload
+def iter_json_records(path: str, model: Type[Person]) -> Iterator[Person]: ...
+
+
+@overload
+def iter_json_records(
+    path: str, model: Type[PersonTypedDict]
+) -> Iterator[PersonTypedDict]: ...
+
+
+@overload
+def iter_json_records(
+    path: str, model: Type[CompactPerson]
+) -> Iterator[CompactPerson]: ...
+
+
+def iter_json_records(path: str = JSON_PATH, model: Any = "pydantic") -> Iterator[Any]:
+    """Yield records of any MODEL_CLASSES model one at a time.
+
+    Peak memory depends on the largest record rather than on the file size.
+    """
+    return build_records(iter_json_record_dicts(path), MODEL_BUILDERS, model)
+
+
+MODEL_BUILDERS = LazyBuilders(
+    {
+        "pydantic": "pydantic_models:FileData.model_validate",
+        "namedtuple": Person.from_dict,
+        "typeddict": parse_dict_to_typeddict,
+        "slots": CompactPerson.from_dict,
+    }
+)
+
+register_reader((".json",), iter_json_record_dicts, MODEL_BUILDERS)
+
+
+# Main execution
+def main(models: Sequence[str] = MODELS, path: str = JSON_PATH) -> None:
+    """Main function to run the selected JSON processing methods.
+
+    The file is parsed once and every row is fanned out to all selected models.
+    """
+    builders = select_builders(MODEL_BUILDERS, models)
+    results = fan_out(iter_json_record_dicts(path), builders)
+
+    if "pydantic" in results:
+        from pydantic_models import DataSchema
+
+        pydantic_data = DataSchema.from_validated(results["pydantic"])
+        print_pydantic_information(pydantic_data)
+
+    if "namedtuple" in results:
+        named_tuple_data = Records(records=results["namedtuple"])
+        print_all_information(named_tuple_data)
+
+    if "typeddict" in results:
+        typeddict_data: RecordsTypedDict = {"records": results["typeddict"]}
+        print_typeddict_information(typeddict_data)
+
+    if "slots" in results:
+        slots_data = CompactRecords(records=results["slots"])
+        print_slots_information(slots_data)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or MODELS)
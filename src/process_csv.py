@@ -1,324 +1,353 @@
 import csv
-from typing import Dict, List, NamedTuple, TypedDict
-
-import pydantic
+import io
+import os
+import sys
+from collections import deque
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    overload,
+)
+
+from cache import iter_cached_rows, worth_caching
+from models import (
+    TYPEDDICT_BUILDERS,
+    CompactPerson,
+    CompactRecords,
+    Person,
+    PersonTypedDict,
+    Records,
+    RecordsTypedDict,
+    compile_csv_row_decoder,
+    model_name,
+)
+from pipeline import MODELS, fan_out, select_builders
+from readers import (
+    Source,
+    build_records,
+    compression_of,
+    open_text_source,
+    register_reader,
+)
+from writers import write_text
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from pydantic_models import DataSchema, FileData
+
+CSV_PATH = "data/documents.csv"
 
 
 # ==================== PYDANTIC MODEL ====================
-class FileNote(pydantic.BaseModel):
-    year: int
-    working_months: int
-    satisfied: bool
-
-
-class FileData(pydantic.BaseModel):
-    name: str
-    age: int
-    id: int
-    salary: int
-    working_years: List[int]
-    is_working: bool
-    notes: List[FileNote] = pydantic.Field(default_factory=list)
-    hobbies: List[str] = pydantic.Field(default_factory=list)
-
-    @classmethod
-    def from_csv_row(cls, row: Dict[str, str]) -> "FileData":
-        """Create FileData from CSV row with proper parsing."""
-        # Parse working_years
-        working_years_str = row.get("working_years", "").strip('"')
-        working_years = (
-            [int(year.strip()) for year in working_years_str.split(",")]
-            if working_years_str
-            else []
-        )
-
-        # Parse notes
-        notes = []
-        notes_years = (
-            row.get("notes_year", "").split(";") if row.get("notes_year") else []
-        )
-        notes_months = (
-            row.get("notes_working_months", "").split(";")
-            if row.get("notes_working_months")
-            else []
-        )
-        notes_satisfied = (
-            row.get("notes_satisfied", "").split(";")
-            if row.get("notes_satisfied")
-            else []
-        )
-
-        for i, year_str in enumerate(notes_years):
-            if year_str:  # Only process if year exists
-                notes.append(
-                    FileNote(
-                        year=int(year_str.strip()),
-                        working_months=int(notes_months[i].strip()),
-                        satisfied=notes_satisfied[i].strip().lower() == "true",
-                    )
-                )
-
-        # Parse hobbies
-        hobbies_str = row.get("hobbies", "").strip('"')
-        hobbies = (
-            [hobby.strip() for hobby in hobbies_str.split(",")] if hobbies_str else []
-        )
-
-        return cls(
-            name=row["name"].strip('"'),
-            age=int(row["age"]),
-            id=int(row["id"]),
-            salary=int(row["salary"]),
-            working_years=working_years,
-            is_working=row["is_working"].lower() == "true",
-            notes=notes,
-            hobbies=hobbies,
-        )
-
-
-class DataSchema(pydantic.BaseModel):
-    records: List[FileData]
-
-
-def process_csv_with_pydantic() -> DataSchema:
+def process_csv_with_pydantic(path: str = CSV_PATH) -> "DataSchema":
     """Process CSV file using Pydantic."""
-    records = []
-    with open("data/documents.csv", "r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            records.append(FileData.from_csv_row(row))
+    from pydantic_models import DataSchema, FileData
 
-    return DataSchema(records=records)
+    records = list(iter_csv_records(path, FileData))
+    return DataSchema.from_validated(records)
 
 
-def print_pydantic_information(data: DataSchema) -> None:
+def print_pydantic_information(data: "DataSchema") -> None:
     """Print all information from Pydantic structure."""
     print("=== PROCESSING CSV DATA FILE USING PYDANTIC ===")
-    for record in data.records:
-        print(f"Name: {record.name}")
-        print(f"Age: {record.age}")
-        print(f"ID: {record.id}")
-        print(f"Salary: {record.salary}")
-        print(f"Working Years: {record.working_years}")
-        print(f"Currently Working: {record.is_working}")
-        print(f"Notes: {record.notes}")
-        print(f"Hobbies: {record.hobbies}")
-        print("-" * 40)
+    write_text(data.records, sys.stdout)
 
 
 # ==================== NAMEDTUPLE ====================
-class Note(NamedTuple):
-    year: int
-    working_months: int
-    satisfied: bool
-
-
-class Person(NamedTuple):
-    name: str
-    age: int
-    id: int
-    salary: int
-    working_years: List[int]
-    is_working: bool
-    notes: List[Note]
-    hobbies: List[str]
-
-    @classmethod
-    def from_csv_row(cls, row: Dict[str, str]) -> "Person":
-        """Create Person from CSV row with proper parsing."""
-        # Parse working_years
-        working_years_str = row.get("working_years", "").strip('"')
-        working_years = (
-            [int(year.strip()) for year in working_years_str.split(",")]
-            if working_years_str
-            else []
-        )
-
-        # Parse notes
-        notes = []
-        notes_years = (
-            row.get("notes_year", "").split(";") if row.get("notes_year") else []
-        )
-        notes_months = (
-            row.get("notes_working_months", "").split(";")
-            if row.get("notes_working_months")
-            else []
-        )
-        notes_satisfied = (
-            row.get("notes_satisfied", "").split(";")
-            if row.get("notes_satisfied")
-            else []
-        )
-
-        for i, year_str in enumerate(notes_years):
-            if year_str:  # Only process if year exists
-                notes.append(
-                    Note(
-                        year=int(year_str.strip()),
-                        working_months=int(notes_months[i].strip()),
-                        satisfied=notes_satisfied[i].strip().lower() == "true",
-                    )
-                )
-
-        # Parse hobbies
-        hobbies_str = row.get("hobbies", "").strip('"')
-        hobbies = (
-            [hobby.strip() for hobby in hobbies_str.split(",")] if hobbies_str else []
-        )
-
-        return cls(
-            name=row["name"].strip('"'),
-            age=int(row["age"]),
-            id=int(row["id"]),
-            salary=int(row["salary"]),
-            working_years=working_years,
-            is_working=row["is_working"].lower() == "true",
-            notes=notes,
-            hobbies=hobbies,
-        )
-
-
-class Records(NamedTuple):
-    records: List[Person]
-
-
-def process_csv_with_namedtuple() -> Records:
+def process_csv_with_namedtuple(path: str = CSV_PATH) -> Records:
     """Process CSV file using NamedTuple."""
-    records = []
-    with open("data/documents.csv", "r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            records.append(Person.from_csv_row(row))
-
+    records = list(iter_csv_records(path, Person))
     return Records(records=records)
 
 
 def print_namedtuple_information(data: Records) -> None:
     """Print all information from NamedTuple structure."""
     print("\n=== Process CSV file using NAMEDTUPLE data structure ===")
-    for person in data.records:
-        print(f"Name: {person.name}")
-        print(f"Age: {person.age}")
-        print(f"ID: {person.id}")
-        print(f"Salary: {person.salary}")
-        print(f"Working Years: {person.working_years}")
-        print(f"Currently Working: {person.is_working}")
-        print(f"Notes: {person.notes}")
-        print(f"Hobbies: {person.hobbies}")
-        print("-" * 40)
+    write_text(data.records, sys.stdout)
 
 
 # ==================== TYPEDDICT ====================
-class NoteTypedDict(TypedDict):
-    year: int
-    working_months: int
-    satisfied: bool
-
-
-class PersonTypedDict(TypedDict):
-    name: str
-    age: int
-    id: int
-    salary: int
-    working_years: List[int]
-    is_working: bool
-    notes: List[NoteTypedDict]
-    hobbies: List[str]
-
-
-class RecordsTypedDict(TypedDict):
-    records: List[PersonTypedDict]
-
-
-def parse_csv_row_to_typeddict(row: Dict[str, str]) -> PersonTypedDict:
-    """Parse CSV row to TypedDict with proper data types."""
-    # Parse working_years
-    working_years_str = row.get("working_years", "").strip('"')
-    working_years = (
-        [int(year.strip()) for year in working_years_str.split(",")]
-        if working_years_str
-        else []
-    )
-
-    # Parse notes
-    notes: List[NoteTypedDict] = []
-    notes_years = row.get("notes_year", "").split(";") if row.get("notes_year") else []
-    notes_months = (
-        row.get("notes_working_months", "").split(";")
-        if row.get("notes_working_months")
-        else []
-    )
-    notes_satisfied = (
-        row.get("notes_satisfied", "").split(";") if row.get("notes_satisfied") else []
-    )
-
-    for i, year_str in enumerate(notes_years):
-        if year_str:  # Only process if year exists
-            notes.append(
-                {
-                    "year": int(year_str.strip()),
-                    "working_months": int(notes_months[i].strip()),
-                    "satisfied": notes_satisfied[i].strip().lower() == "true",
-                }
-            )
-
-    # Parse hobbies
-    hobbies_str = row.get("hobbies", "").strip('"')
-    hobbies = [hobby.strip() for hobby in hobbies_str.split(",")] if hobbies_str else []
-
-    return {
-        "name": row["name"].strip('"'),
-        "age": int(row["age"]),
-        "id": int(row["id"]),
-        "salary": int(row["salary"]),
-        "working_years": working_years,
-        "is_working": row["is_working"].lower() == "true",
-        "notes": notes,
-        "hobbies": hobbies,
-    }
-
-
-def process_csv_with_typeddict() -> RecordsTypedDict:
+def process_csv_with_typeddict(path: str = CSV_PATH) -> RecordsTypedDict:
     """Process CSV file using TypedDict."""
-    records = []
-    with open("data/documents.csv", "r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            records.append(parse_csv_row_to_typeddict(row))
-
+    records = list(iter_csv_records(path, PersonTypedDict))
     return {"records": records}
 
 
 def print_typeddict_information(data: RecordsTypedDict) -> None:
     """Print all information from TypedDict structure."""
     print("\n=== PROCESSING CSV FILE USING TYPED-DICT data structure ===")
-    for person in data["records"]:
-        print(f"Name: {person['name']}")
-        print(f"Age: {person['age']}")
-        print(f"ID: {person['id']}")
-        print(f"Salary: {person['salary']}")
-        print(f"Working Years: {person['working_years']}")
-        print(f"Currently Working: {person['is_working']}")
-        print(f"Notes: {person['notes']}")
-        print(f"Hobbies: {person['hobbies']}")
-        print("-" * 40)
+    write_text(data["records"], sys.stdout)
 
 
-# ==================== MAIN EXECUTION ====================
-def main() -> None:
-    """Main function to run all CSV processing methods."""
-    # Process with Pydantic
-    pydantic_data = process_csv_with_pydantic()
-    print_pydantic_information(pydantic_data)
+# ==================== SLOTS ====================
+def process_csv_with_slots(path: str = CSV_PATH) -> CompactRecords:
+    """Process CSV file using __slots__ records."""
+    records = list(iter_csv_records(path, CompactPerson))
+    return CompactRecords(records=records)
+
+
+def print_slots_information(data: CompactRecords) -> None:
+    """Print all information from the slots structure."""
+    print("\n=== PROCESSING CSV FILE USING SLOTS data structure ===")
+    write_text(data.records, sys.stdout)
+
+
+# ==================== STREAMING ====================
+def iter_csv_rows(path: Source = CSV_PATH) -> Iterator[PersonTypedDict]:
+    """Yield decoded CSV rows one at a time, keeping the file open while iterating.
+
+    Rows are read as plain lists and decoded by column index with a decoder
+    compiled once from the header; blank lines are skipped.
+    """
+    with open_text_source(path) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is not None:
+            yield from map(compile_csv_row_decoder(tuple(header)), filter(None, reader))
+
+
+@overload
+def iter_csv_records(
+    path: str = ..., model: "Type[FileData]" = ...
+) -> "Iterator[FileData]": ...
+
+
+@overload
+def iter_csv_records(path: str, model: Type[Person]) -> Iterator[Person]: ...
+
+
+@overload
+def iter_csv_records(
+    path: str, model: Type[PersonTypedDict]
+) -> Iterator[PersonTypedDict]: ...
+
+
+@overload
+def iter_csv_records(
+    path: str, model: Type[CompactPerson]
+) -> Iterator[CompactPerson]: ...
+
+
+def iter_csv_records(path: str = CSV_PATH, model: Any = "pydantic") -> Iterator[Any]:
+    """Yield records of any MODEL_CLASSES model one row at a time.
+
+    Only the current row is held in memory, so files of any size can be
+    processed in constant memory.
+    """
+    return build_records(iter_csv_rows(path), MODEL_BUILDERS, model)
+
+
+# Rows arrive decoded, so every model is built from the shared PersonTypedDict
+MODEL_BUILDERS = TYPEDDICT_BUILDERS
+
+register_reader((".csv",), iter_csv_rows, MODEL_BUILDERS)
+
+
+# ==================== PARALLEL ====================
+PARALLEL_CHUNK_SIZE = 8 * 1024 * 1024
+_SCAN_BLOCK_SIZE = 1024 * 1024
+
+
+def csv_chunk_ranges(
+    path: str = CSV_PATH, chunk_size: int = PARALLEL_CHUNK_SIZE
+) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """Split a CSV file into byte ranges of about chunk_size that end on a record.
+
+    A newline only ends a record when it is outside a quoted field, i.e. when
+    an even number of quote characters precede it, so quoted values such as
+    "1997,1998,1999,2000" (or values spanning lines) are never cut in two.
+    Returns the header field names and the (start, end) offsets of each chunk.
+    """
+    if compression_of(path):
+        raise ValueError(f"Parallel CSV parsing needs an uncompressed file: {path}")
+    ranges: List[Tuple[int, int]] = []
+    with open(path, "rb") as f:
+        header = f.readline()
+        fieldnames = next(csv.reader([header.decode("utf-8")]), [])
+        offset = chunk_start = len(header)
+        quotes = 0  # parity of quote characters before the current block
+        while True:
+            block = f.read(_SCAN_BLOCK_SIZE)
+            if not block:
+                break
+            pos = max(0, chunk_start + chunk_size - offset)
+            while pos < len(block):
+                newline = block.find(b"\n", pos)
+                if newline < 0:
+                    break
+                if (quotes + block.count(b'"', 0, newline)) % 2 == 0:
+                    chunk_end = offset + newline + 1
+                    ranges.append((chunk_start, chunk_end))
+                    chunk_start = chunk_end
+                    pos = max(newline + 1, chunk_start + chunk_size - offset)
+                else:
+                    pos = newline + 1
+            quotes = (quotes + block.count(b'"')) % 2
+            offset += len(block)
+    if chunk_start < offset:
+        ranges.append((chunk_start, offset))
+    return fieldnames, ranges
+
+
+def _parse_csv_chunk(
+    path: str, start: int, end: int, fieldnames: List[str], models: Sequence[str]
+) -> Dict[str, List[Any]]:
+    """Worker: parse one byte range and build every requested model."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    decode = compile_csv_row_decoder(tuple(fieldnames))
+    rows = map(decode, filter(None, csv.reader(io.StringIO(text, newline=""))))
+    return fan_out(rows, select_builders(MODEL_BUILDERS, models))
+
+
+def iter_csv_chunks_parallel(
+    path: str = CSV_PATH,
+    models: Sequence[str] = MODELS,
+    workers: Optional[int] = None,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+) -> Iterator[Dict[str, List[Any]]]:
+    """Parse and validate CSV chunks in a process pool, yielding them in file order.
+
+    Each result maps a model name to the records of one chunk. At most two
+    chunks per worker are in flight, so memory stays bounded on large files.
+    """
+    select_builders(MODEL_BUILDERS, models)  # fail fast on unknown models
+    fieldnames, ranges = csv_chunk_ranges(path, chunk_size)
+    workers = workers or os.cpu_count() or 1
+    from concurrent.futures import ProcessPoolExecutor
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending: Deque[Future[Dict[str, List[Any]]]] = deque()
+    try:
+        for start, end in ranges:
+            pending.append(
+                executor.submit(
+                    _parse_csv_chunk, path, start, end, fieldnames, tuple(models)
+                )
+            )
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+@overload
+def iter_csv_records_parallel(
+    path: str = ...,
+    model: "Type[FileData]" = ...,
+    workers: Optional[int] = ...,
+    chunk_size: int = ...,
+) -> "Iterator[FileData]": ...
+
+
+@overload
+def iter_csv_records_parallel(
+    path: str,
+    model: Type[Person],
+    workers: Optional[int] = ...,
+    chunk_size: int = ...,
+) -> Iterator[Person]: ...
+
+
+@overload
+def iter_csv_records_parallel(
+    path: str,
+    model: Type[PersonTypedDict],
+    workers: Optional[int] = ...,
+    chunk_size: int = ...,
+) -> Iterator[PersonTypedDict]: ...
+
+
+@overload
+def iter_csv_records_parallel(
+    path: str,
+    model: Type[CompactPerson],
+    workers: Optional[int] = ...,
+    chunk_size: int = ...,
+) -> Iterator[CompactPerson]: ...
+
+
+@overload
+def iter_csv_records_parallel(
+    path: str,
+    model: str,
+    workers: Optional[int] = ...,
+    chunk_size: int = ...,
+) -> Iterator[Any]: ...
+
+
+def iter_csv_records_parallel(
+    path: str = CSV_PATH,
+    model: Any = "pydantic",
+    workers: Optional[int] = None,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+) -> Iterator[Any]:
+    """Parallel counterpart of iter_csv_records; records keep their file order."""
+    name = model_name(model)
+    for chunk in iter_csv_chunks_parallel(path, (name,), workers, chunk_size):
+        yield from chunk[name]
 
-    # Process with NamedTuple
-    namedtuple_data = process_csv_with_namedtuple()
-    print_namedtuple_information(namedtuple_data)
 
-    # Process with TypedDict
-    typeddict_data = process_csv_with_typeddict()
-    print_typeddict_information(typeddict_data)
+# ==================== MAIN EXECUTION ====================
+def main(
+    models: Sequence[str] = MODELS,
+    path: str = CSV_PATH,
+    workers: int = 1,
+    cache_dir: Optional[str] = None,
+) -> None:
+    """Main function to run the selected CSV processing methods.
+
+    The file is parsed once and every row is fanned out to all selected models.
+    With workers > 1 the file is parsed in chunks across a process pool.
+    With a cache_dir (e.g. cache.CACHE_DIR), parsed records of files of at
+    least CACHE_MIN_SIZE bytes are cached there, so later runs on an unchanged
+    file skip the CSV parser entirely.
+    """
+    results: Dict[str, List[Any]]
+    if cache_dir is not None and worth_caching(path):
+        parse = partial(iter_csv_records_parallel, path, PersonTypedDict, workers)
+        rows = iter_cached_rows(path, cache_dir, parse if workers > 1 else None)
+        results = fan_out(rows, select_builders(TYPEDDICT_BUILDERS, models))
+    elif workers > 1:
+        builders = select_builders(MODEL_BUILDERS, models)
+        results = {model: [] for model in builders}
+        for chunk in iter_csv_chunks_parallel(path, models, workers):
+            for model, records in chunk.items():
+                results[model].extend(records)
+    else:
+        results = fan_out(iter_csv_rows(path), select_builders(MODEL_BUILDERS, models))
+
+    if "pydantic" in results:
+        from pydantic_models import DataSchema
+
+        pydantic_data = DataSchema.from_validated(results["pydantic"])
+        print_pydantic_information(pydantic_data)
+
+    if "namedtuple" in results:
+        namedtuple_data = Records(records=results["namedtuple"])
+        print_namedtuple_information(namedtuple_data)
+
+    if "typeddict" in results:
+        typeddict_data: RecordsTypedDict = {"records": results["typeddict"]}
+        print_typeddict_information(typeddict_data)
+
+    if "slots" in results:
+        slots_data = CompactRecords(records=results["slots"])
+        print_slots_information(slots_data)
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:] or MODELS)
@@ -1,35 +1,20 @@
-import time
-from typing import Any, Callable, List, TypeVar
+from typing import List
 
 import numpy as np
+import numpy.typing as npt
 
-# Add type variables for better typing
-T = TypeVar("T")
-R = TypeVar("R")
-
-
-# FIXED: Added proper type parameters to Callable
-def measure_time(func: Callable[..., R]) -> Callable[..., R]:
-    # FIXED: Added type annotations for arguments
-    def wrapper(*args: Any, **kwargs: Any) -> R:
-        start_time = time.perf_counter()
-        result = func(*args, **kwargs)
-        end_time = time.perf_counter()
-        execution_time = end_time - start_time
-        return result, execution_time  # type: ignore
-
-    return wrapper
+from instrumentation import Timer
 
 
 # Scalar-vector multiplication with plain Python list
-@measure_time
 def python_scalar_multiply(scalar: float, vector: List[float]) -> List[float]:
     return [scalar * x for x in vector]
 
 
 # Scalar-vector multiplication with NumPy array
-@measure_time
-def numpy_scalar_multiply(scalar: float, vector: np.ndarray) -> np.ndarray:
+def numpy_scalar_multiply(
+    scalar: float, vector: npt.NDArray[np.float64]
+) -> npt.NDArray[np.float64]:
     return scalar * vector
 
 
@@ -63,10 +48,9 @@ def main() -> None:
     # Python list timing
     python_times = []
     for i in range(iterations):
-        start = time.perf_counter()
-        _ = python_scalar_multiply(scalar, python_list)
-        end = time.perf_counter()
-        iteration_time = end - start
+        with Timer() as timer:
+            python_scalar_multiply(scalar, python_list)
+        iteration_time = timer.seconds
         python_times.append(iteration_time)
         print(f"Iteration {i + 1}: {iteration_time:.6f} seconds")
 
@@ -75,10 +59,9 @@ def main() -> None:
     # NumPy array timing
     numpy_times = []
     for i in range(iterations):
-        start = time.perf_counter()
-        _ = numpy_scalar_multiply(scalar, numpy_array)
-        end = time.perf_counter()
-        iteration_time = end - start
+        with Timer() as timer:
+            numpy_scalar_multiply(scalar, numpy_array)
+        iteration_time = timer.seconds
         numpy_times.append(iteration_time)
         print(f"Iteration {i + 1}: {iteration_time:.6f} seconds")
 
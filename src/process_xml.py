@@ -1,381 +1,188 @@
+import sys
 import xml.etree.ElementTree as ET
-from typing import List, NamedTuple, TypedDict
-
-import pydantic
-
-
-# ==================== PYTHONIC MODEL ====================
-class FileNote(pydantic.BaseModel):
-    year: int
-    working_months: int
-    satisfied: bool
-
-
-class FileData(pydantic.BaseModel):
-    name: str
-    age: int
-    id: int
-    salary: int
-    working_years: List[int]
-    is_working: bool
-    notes: List[FileNote] = pydantic.Field(default_factory=list)
-    hobbies: List[str] = pydantic.Field(default_factory=list)
-
-    @classmethod
-    def from_xml_element(cls, element: ET.Element) -> "FileData":
-        """Create FileData from XML element with proper parsing."""
-        # Parse basic fields
-        name = element.findtext("name", "").strip()
-
-        # FIXED: All int conversions with null checks
-        age_text = element.findtext("age", "0")
-        age = int(age_text) if age_text is not None else 0
-
-        id_text = element.findtext("id", "0")
-        id_num = int(id_text) if id_text is not None else 0
-
-        salary_text = element.findtext("salary", "0")
-        salary = int(salary_text) if salary_text is not None else 0
-
-        is_working = element.findtext("is_working", "false").lower() == "true"
-
-        # Parse working_years
-        working_years_element = element.find("working_years")
-        working_years = (
-            [
-                int(year.text)
-                for year in working_years_element.findall("year")
-                if year.text is not None
-            ]
-            if working_years_element is not None
-            else []
-        )
-
-        # Parse notes
-        notes = []
-        notes_element = element.find("notes")
-        if notes_element is not None:
-            for note_element in notes_element.findall("note"):
-                # FIXED: All int conversions with null checks
-                year_text = note_element.findtext("year", "0")
-                months_text = note_element.findtext("working_months", "0")
-                satisfied_text = note_element.findtext("satisfied", "false")
-
-                note = FileNote(
-                    year=int(year_text) if year_text is not None else 0,
-                    working_months=int(months_text) if months_text is not None else 0,
-                    satisfied=satisfied_text.lower() == "true"
-                    if satisfied_text is not None
-                    else False,
-                )
-                notes.append(note)
-
-        # Parse hobbies
-        hobbies = []
-        hobbies_element = element.find("hobbies")
-        if hobbies_element is not None:
-            hobbies = [
-                hobby.text.strip()
-                for hobby in hobbies_element.findall("hobby")
-                if hobby.text is not None
-            ]
-
-        return cls(
-            name=name,
-            age=age,
-            id=id_num,
-            salary=salary,
-            working_years=working_years,
-            is_working=is_working,
-            notes=notes,
-            hobbies=hobbies,
-        )
-
-
-class DataSchema(pydantic.BaseModel):
-    records: List[FileData]
-
-
-def process_xml_with_pydantic() -> DataSchema:
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterator,
+    Optional,
+    Sequence,
+    Type,
+    overload,
+)
+
+from cache import iter_cached_rows, worth_caching
+from models import (
+    TYPEDDICT_BUILDERS,
+    CompactPerson,
+    CompactRecords,
+    Person,
+    PersonTypedDict,
+    Records,
+    RecordsTypedDict,
+    parse_xml_element_to_typeddict,
+)
+from pipeline import MODELS, LazyBuilders, fan_out, select_builders
+from readers import Source, build_records, open_source, register_reader
+from writers import write_text
+
+if TYPE_CHECKING:
+    from pydantic_models import DataSchema, FileData
+
+XML_PATH = "data/documents.xml"
+
+
+# ==================== PYDANTIC MODEL ====================
+def process_xml_with_pydantic(path: str = XML_PATH) -> "DataSchema":
     """Process XML file using Pydantic."""
-    tree = ET.parse("data/documents.xml")
-    root = tree.getroot()
+    from pydantic_models import DataSchema, FileData
 
-    records = []
-    for record_element in root.findall("record"):
-        records.append(FileData.from_xml_element(record_element))
+    records = list(iter_xml_records(path, FileData))
+    return DataSchema.from_validated(records)
 
-    return DataSchema(records=records)
 
-
-def print_pydantic_information(data: DataSchema) -> None:
+def print_pydantic_information(data: "DataSchema") -> None:
     """Print all information from Pydantic structure."""
     print("=== PROCESS XML FILE USING PYDANTIC data stucture ===")
-    for record in data.records:
-        print(f"Name: {record.name}")
-        print(f"Age: {record.age}")
-        print(f"ID: {record.id}")
-        print(f"Salary: {record.salary}")
-        print(f"Working Years: {record.working_years}")
-        print(f"Currently Working: {record.is_working}")
-        print(f"Notes: {record.notes}")
-        print(f"Hobbies: {record.hobbies}")
-        print("-" * 40)
+    write_text(data.records, sys.stdout)
 
 
 # ==================== NAMEDTUPLE ====================
-class Note(NamedTuple):
-    year: int
-    working_months: int
-    satisfied: bool
-
-
-class Person(NamedTuple):
-    name: str
-    age: int
-    id: int
-    salary: int
-    working_years: List[int]
-    is_working: bool
-    notes: List[Note]
-    hobbies: List[str]
-
-    @classmethod
-    def from_xml_element(cls, element: ET.Element) -> "Person":
-        """Create Person from XML element with proper parsing."""
-        # Parse basic fields
-        name = element.findtext("name", "").strip()
-
-        # FIXED: All int conversions with null checks
-        age_text = element.findtext("age", "0")
-        age = int(age_text) if age_text is not None else 0
-
-        id_text = element.findtext("id", "0")
-        id_num = int(id_text) if id_text is not None else 0
-
-        salary_text = element.findtext("salary", "0")
-        salary = int(salary_text) if salary_text is not None else 0
-
-        is_working = element.findtext("is_working", "false").lower() == "true"
-
-        # Parse working_years
-        working_years_element = element.find("working_years")
-        working_years = (
-            [
-                int(year.text)
-                for year in working_years_element.findall("year")
-                if year.text is not None
-            ]
-            if working_years_element is not None
-            else []
-        )
-
-        # Parse notes
-        notes = []
-        notes_element = element.find("notes")
-        if notes_element is not None:
-            for note_element in notes_element.findall("note"):
-                # FIXED: All int conversions with null checks
-                year_text = note_element.findtext("year", "0")
-                months_text = note_element.findtext("working_months", "0")
-                satisfied_text = note_element.findtext("satisfied", "false")
-
-                note = Note(
-                    year=int(year_text) if year_text is not None else 0,
-                    working_months=int(months_text) if months_text is not None else 0,
-                    satisfied=satisfied_text.lower() == "true"
-                    if satisfied_text is not None
-                    else False,
-                )
-                notes.append(note)
-
-        # Parse hobbies
-        hobbies = []
-        hobbies_element = element.find("hobbies")
-        if hobbies_element is not None:
-            hobbies = [
-                hobby.text.strip()
-                for hobby in hobbies_element.findall("hobby")
-                if hobby.text is not None
-            ]
-
-        return cls(
-            name=name,
-            age=age,
-            id=id_num,
-            salary=salary,
-            working_years=working_years,
-            is_working=is_working,
-            notes=notes,
-            hobbies=hobbies,
-        )
-
-
-class Records(NamedTuple):
-    records: List[Person]
-
-
-def process_xml_with_namedtuple() -> Records:
+def process_xml_with_namedtuple(path: str = XML_PATH) -> Records:
     """Process XML file using NamedTuple."""
-    tree = ET.parse("data/documents.xml")
-    root = tree.getroot()
-
-    records = []
-    for record_element in root.findall("record"):
-        records.append(Person.from_xml_element(record_element))
-
+    records = list(iter_xml_records(path, Person))
     return Records(records=records)
 
 
 def print_namedtuple_information(data: Records) -> None:
     """Print all information from NamedTuple structure."""
     print("\n=== PROCESS XML FILE USING NAMEDTUPLE data structure ===")
-    for person in data.records:
-        print(f"Name: {person.name}")
-        print(f"Age: {person.age}")
-        print(f"ID: {person.id}")
-        print(f"Salary: {person.salary}")
-        print(f"Working Years: {person.working_years}")
-        print(f"Currently Working: {person.is_working}")
-        print(f"Notes: {person.notes}")
-        print(f"Hobbies: {person.hobbies}")
-        print("-" * 40)
+    write_text(data.records, sys.stdout)
 
 
 # ==================== TYPEDDICT ====================
-class NoteTypedDict(TypedDict):
-    year: int
-    working_months: int
-    satisfied: bool
-
-
-class PersonTypedDict(TypedDict):
-    name: str
-    age: int
-    id: int
-    salary: int
-    working_years: List[int]
-    is_working: bool
-    notes: List[NoteTypedDict]
-    hobbies: List[str]
-
-
-class RecordsTypedDict(TypedDict):
-    records: List[PersonTypedDict]
-
-
-def parse_xml_element_to_typeddict(element: ET.Element) -> PersonTypedDict:
-    """Parse XML element to TypedDict with proper data types."""
-    # Parse basic fields
-    name = element.findtext("name", "").strip()
-
-    # FIXED: All int conversions with null checks
-    age_text = element.findtext("age", "0")
-    age = int(age_text) if age_text is not None else 0
-
-    id_text = element.findtext("id", "0")
-    id_num = int(id_text) if id_text is not None else 0
-
-    salary_text = element.findtext("salary", "0")
-    salary = int(salary_text) if salary_text is not None else 0
-
-    is_working = element.findtext("is_working", "false").lower() == "true"
-
-    # Parse working_years
-    working_years_element = element.find("working_years")
-    working_years = (
-        [
-            int(year.text)
-            for year in working_years_element.findall("year")
-            if year.text is not None
-        ]
-        if working_years_element is not None
-        else []
-    )
-
-    # Parse notes
-    notes: List[NoteTypedDict] = []
-    notes_element = element.find("notes")
-    if notes_element is not None:
-        for note_element in notes_element.findall("note"):
-            # FIXED: All int conversions with null checks
-            year_text = note_element.findtext("year", "0")
-            months_text = note_element.findtext("working_months", "0")
-            satisfied_text = note_element.findtext("satisfied", "false")
-
-            note: NoteTypedDict = {
-                "year": int(year_text) if year_text is not None else 0,
-                "working_months": int(months_text) if months_text is not None else 0,
-                "satisfied": satisfied_text.lower() == "true"
-                if satisfied_text is not None
-                else False,
-            }
-            notes.append(note)
-
-    # Parse hobbies
-    hobbies = []
-    hobbies_element = element.find("hobbies")
-    if hobbies_element is not None:
-        hobbies = [
-            hobby.text.strip()
-            for hobby in hobbies_element.findall("hobby")
-            if hobby.text is not None
-        ]
-
-    return {
-        "name": name,
-        "age": age,
-        "id": id_num,
-        "salary": salary,
-        "working_years": working_years,
-        "is_working": is_working,
-        "notes": notes,
-        "hobbies": hobbies,
-    }
-
-
-def process_xml_with_typeddict() -> RecordsTypedDict:
+def process_xml_with_typeddict(path: str = XML_PATH) -> RecordsTypedDict:
     """Process XML file using TypedDict."""
-    tree = ET.parse("data/documents.xml")
-    root = tree.getroot()
-
-    records = []
-    for record_element in root.findall("record"):
-        records.append(parse_xml_element_to_typeddict(record_element))
-
+    records = list(iter_xml_records(path, PersonTypedDict))
     return {"records": records}
 
 
 def print_typeddict_information(data: RecordsTypedDict) -> None:
     """Print all information from TypedDict structure."""
     print("\n=== PROCESS XML file using TypedDict data structure ===")
-    for person in data["records"]:
-        print(f"Name: {person['name']}")
-        print(f"Age: {person['age']}")
-        print(f"ID: {person['id']}")
-        print(f"Salary: {person['salary']}")
-        print(f"Working Years: {person['working_years']}")
-        print(f"Currently Working: {person['is_working']}")
-        print(f"Notes: {person['notes']}")
-        print(f"Hobbies: {person['hobbies']}")
-        print("-" * 40)
+    write_text(data["records"], sys.stdout)
 
 
-# ==================== MAIN EXECUTION ====================
-def main() -> None:
-    """Main function to run all XML processing methods."""
-    # Process with Pydantic
-    pydantic_data = process_xml_with_pydantic()
-    print_pydantic_information(pydantic_data)
+# ==================== SLOTS ====================
+def process_xml_with_slots(path: str = XML_PATH) -> CompactRecords:
+    """Process XML file using __slots__ records."""
+    records = list(iter_xml_records(path, CompactPerson))
+    return CompactRecords(records=records)
+
+
+def print_slots_information(data: CompactRecords) -> None:
+    """Print all information from the slots structure."""
+    print("\n=== PROCESS XML FILE USING SLOTS data structure ===")
+    write_text(data.records, sys.stdout)
+
+
+# ==================== STREAMING ====================
+def iter_xml_elements(path: Source = XML_PATH) -> Iterator[ET.Element]:
+    """Yield each top-level <record> element as soon as its end tag is parsed.
+
+    Finished records are cleared from the root once the caller has consumed
+    them, so memory stays flat regardless of the file size.
+    """
+    with open_source(path) as f:
+        context = ET.iterparse(f, events=("start", "end"))
+        _, root = next(context)
+        depth = 0
+        for event, element in context:
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 0 and element.tag == "record":
+                yield element
+                root.clear()
+
 
-    # Process with NamedTuple
-    namedtuple_data = process_xml_with_namedtuple()
-    print_namedtuple_information(namedtuple_data)
+@overload
+def iter_xml_records(
+    path: str = ..., model: "Type[FileData]" = ...
+) -> "Iterator[FileData]": ...
 
-    # Process with TypedDict
-    typeddict_data = process_xml_with_typeddict()
-    print_typeddict_information(typeddict_data)
+
+@overload
+def iter_xml_records(path: str, model: Type[Person]) -> Iterator[Person]: ...
+
+
+@overload
+def iter_xml_records(
+    path: str, model: Type[PersonTypedDict]
+) -> Iterator[PersonTypedDict]: ...
+
+
+@overload
+def iter_xml_records(
+    path: str, model: Type[CompactPerson]
+) -> Iterator[CompactPerson]: ...
+
+
+def iter_xml_records(path: str = XML_PATH, model: Any = "pydantic") -> Iterator[Any]:
+    """Yield records of any MODEL_CLASSES model one element at a time."""
+    return build_records(iter_xml_elements(path), MODEL_BUILDERS, model)
+
+
+MODEL_BUILDERS = LazyBuilders(
+    {
+        "pydantic": "pydantic_models:FileData.from_xml_element",
+        "namedtuple": Person.from_xml_element,
+        "typeddict": parse_xml_element_to_typeddict,
+        "slots": CompactPerson.from_xml_element,
+    }
+)
+
+register_reader((".xml",), iter_xml_elements, MODEL_BUILDERS)
+
+
+# ==================== MAIN EXECUTION ====================
+def main(
+    models: Sequence[str] = MODELS,
+    path: str = XML_PATH,
+    cache_dir: Optional[str] = None,
+) -> None:
+    """Main function to run the selected XML processing methods.
+
+    The file is parsed once and every row is fanned out to all selected models.
+    With a cache_dir (e.g. cache.CACHE_DIR), parsed records of files of at
+    least CACHE_MIN_SIZE bytes are cached there, so later runs on an unchanged
+    file skip the XML parser entirely.
+    """
+    if cache_dir is None or not worth_caching(path):
+        builders = select_builders(MODEL_BUILDERS, models)
+        results = fan_out(iter_xml_elements(path), builders)
+    else:
+        builders = select_builders(TYPEDDICT_BUILDERS, models)
+        results = fan_out(iter_cached_rows(path, cache_dir), builders)
+
+    if "pydantic" in results:
+        from pydantic_models import DataSchema
+
+        pydantic_data = DataSchema.from_validated(results["pydantic"])
+        print_pydantic_information(pydantic_data)
+
+    if "namedtuple" in results:
+        namedtuple_data = Records(records=results["namedtuple"])
+        print_namedtuple_information(namedtuple_data)
+
+    if "typeddict" in results:
+        typeddict_data: RecordsTypedDict = {"records": results["typeddict"]}
+        print_typeddict_information(typeddict_data)
+
+    if "slots" in results:
+        slots_data = CompactRecords(records=results["slots"])
+        print_slots_information(slots_data)
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:] or MODELS)
@@ -1,238 +1,293 @@
-from typing import Any, Dict, List, NamedTuple, TypedDict
+import sys
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    Optional,
+    Sequence,
+    Type,
+    cast,
+    overload,
+)
 
-import pydantic
 import yaml
 
+from cache import iter_cached_rows, worth_caching
+from models import (
+    TYPEDDICT_BUILDERS,
+    CompactPerson,
+    CompactRecords,
+    Person,
+    PersonTypedDict,
+    Records,
+    RecordsTypedDict,
+    parse_dict_to_typeddict,
+)
+from pipeline import MODELS, LazyBuilders, fan_out, select_builders
+from readers import Source, build_records, open_text_source, register_reader
+from writers import write_text
 
-# ==================== PYTHONIC MODEL ====================
-class FileNote(pydantic.BaseModel):
-    year: int
-    working_months: int
-    satisfied: bool
-
-
-class FileData(pydantic.BaseModel):
-    name: str
-    age: int
-    id: int
-    salary: int
-    working_years: List[int]
-    is_working: bool
-    notes: List[FileNote] = pydantic.Field(default_factory=list)
-    hobbies: List[str] = pydantic.Field(default_factory=list)
-
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "FileData":
-        """Create FileData from dictionary with proper parsing."""
-        # Handle missing fields with defaults
-        notes_data = data.get("notes", [])
-        notes = [FileNote(**note) for note in notes_data]
-
-        hobbies = data.get("hobbies", [])
-
-        return cls(
-            name=data["name"],
-            age=data["age"],
-            id=data["id"],
-            salary=data["salary"],
-            working_years=data["working_years"],
-            is_working=data["is_working"],
-            notes=notes,
-            hobbies=hobbies,
-        )
+if TYPE_CHECKING:
+    from pydantic_models import DataSchema, FileData
 
+YAML_PATH = "data/documents.YAML"
 
-class DataSchema(pydantic.BaseModel):
-    records: List[FileData]
+# Prefer the libyaml C parser when PyYAML was built against it
+_Loader: Any = yaml.CSafeLoader if yaml.__with_libyaml__ else yaml.SafeLoader
 
 
-def process_yaml_with_pydantic() -> DataSchema:
+# ==================== PYDANTIC MODEL ====================
+def process_yaml_with_pydantic(path: str = YAML_PATH) -> "DataSchema":
     """Process YAML file using Pydantic."""
-    with open("data/documents.yaml", "r", encoding="utf-8") as f:
-        yaml_data = yaml.safe_load(f)
-
-    records = []
-    for record_data in yaml_data["records"]:
-        records.append(FileData.from_dict(record_data))
+    from pydantic_models import DataSchema, FileData
 
-    return DataSchema(records=records)
+    records = list(iter_yaml_records(path, FileData))
+    return DataSchema.from_validated(records)
 
 
-def print_pydantic_information(data: DataSchema) -> None:
+def print_pydantic_information(data: "DataSchema") -> None:
     """Print all information from Pydantic structure."""
     print("=== PROCESS YAML FILE using PYDANTIC data structure ===")
-    for record in data.records:
-        print(f"Name: {record.name}")
-        print(f"Age: {record.age}")
-        print(f"ID: {record.id}")
-        print(f"Salary: {record.salary}")
-        print(f"Working Years: {record.working_years}")
-        print(f"Currently Working: {record.is_working}")
-        print(f"Notes: {record.notes}")
-        print(f"Hobbies: {record.hobbies}")
-        print("-" * 40)
+    write_text(data.records, sys.stdout)
 
 
 # ==================== NAMEDTUPLE ====================
-class Note(NamedTuple):
-    year: int
-    working_months: int
-    satisfied: bool
-
-
-class Person(NamedTuple):
-    name: str
-    age: int
-    id: int
-    salary: int
-    working_years: List[int]
-    is_working: bool
-    notes: List[Note]
-    hobbies: List[str]
-
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "Person":
-        """Create Person from dictionary with proper parsing."""
-        # Handle missing fields with defaults
-        notes_data = data.get("notes", [])
-        notes = [Note(**note) for note in notes_data]
-
-        hobbies = data.get("hobbies", [])
-
-        return cls(
-            name=data["name"],
-            age=data["age"],
-            id=data["id"],
-            salary=data["salary"],
-            working_years=data["working_years"],
-            is_working=data["is_working"],
-            notes=notes,
-            hobbies=hobbies,
-        )
-
-
-class Records(NamedTuple):
-    records: List[Person]
-
-
-def process_yaml_with_namedtuple() -> Records:
+def process_yaml_with_namedtuple(path: str = YAML_PATH) -> Records:
     """Process YAML file using NamedTuple."""
-    with open("data/documents.yaml", "r", encoding="utf-8") as f:
-        yaml_data = yaml.safe_load(f)
-
-    records = []
-    for record_data in yaml_data["records"]:
-        records.append(Person.from_dict(record_data))
-
+    records = list(iter_yaml_records(path, Person))
     return Records(records=records)
 
 
 def print_namedtuple_information(data: Records) -> None:
     """Print all information from NamedTuple structure."""
     print("\n=== PROCESS YAML DATA FILE Using NamedTuple data structure ===")
-    for person in data.records:
-        print(f"Name: {person.name}")
-        print(f"Age: {person.age}")
-        print(f"ID: {person.id}")
-        print(f"Salary: {person.salary}")
-        print(f"Working Years: {person.working_years}")
-        print(f"Currently Working: {person.is_working}")
-        print(f"Notes: {person.notes}")
-        print(f"Hobbies: {person.hobbies}")
-        print("-" * 40)
+    write_text(data.records, sys.stdout)
 
 
 # ==================== TYPEDDICT ====================
-class NoteTypedDict(TypedDict):
-    year: int
-    working_months: int
-    satisfied: bool
-
-
-class PersonTypedDict(TypedDict):
-    name: str
-    age: int
-    id: int
-    salary: int
-    working_years: List[int]
-    is_working: bool
-    notes: List[NoteTypedDict]
-    hobbies: List[str]
-
-
-class RecordsTypedDict(TypedDict):
-    records: List[PersonTypedDict]
-
-
-def parse_dict_to_typeddict(data: Dict[str, Any]) -> PersonTypedDict:
-    """Parse dictionary to TypedDict with proper data types."""
-    # Handle missing fields with defaults
-    notes_data = data.get("notes", [])
-    notes: List[NoteTypedDict] = [
-        {
-            "year": note["year"],
-            "working_months": note["working_months"],
-            "satisfied": note["satisfied"],
-        }
-        for note in notes_data
-    ]
-
-    hobbies = data.get("hobbies", [])
-
-    return {
-        "name": data["name"],
-        "age": data["age"],
-        "id": data["id"],
-        "salary": data["salary"],
-        "working_years": data["working_years"],
-        "is_working": data["is_working"],
-        "notes": notes,
-        "hobbies": hobbies,
-    }
-
-
-def process_yaml_with_typeddict() -> RecordsTypedDict:
+def process_yaml_with_typeddict(path: str = YAML_PATH) -> RecordsTypedDict:
     """Process YAML file using TypedDict."""
-    with open("data/documents.yaml", "r", encoding="utf-8") as f:
-        yaml_data = yaml.safe_load(f)
-
-    records = []
-    for record_data in yaml_data["records"]:
-        records.append(parse_dict_to_typeddict(record_data))
-
+    records = list(iter_yaml_records(path, PersonTypedDict))
     return {"records": records}
 
 
 def print_typeddict_information(data: RecordsTypedDict) -> None:
     """Print all information from TypedDict structure."""
     print("\n=== PROCESS YAML FILE Using TypedDict data structure ===")
-    for person in data["records"]:
-        print(f"Name: {person['name']}")
-        print(f"Age: {person['age']}")
-        print(f"ID: {person['id']}")
-        print(f"Salary: {person['salary']}")
-        print(f"Working Years: {person['working_years']}")
-        print(f"Currently Working: {person['is_working']}")
-        print(f"Notes: {person['notes']}")
-        print(f"Hobbies: {person['hobbies']}")
-        print("-" * 40)
+    write_text(data["records"], sys.stdout)
 
 
-# ==================== MAIN EXECUTION ====================
-def main() -> None:
-    """Main function to run all YAML processing methods."""
-    # Process with Pydantic
-    pydantic_data = process_yaml_with_pydantic()
-    print_pydantic_information(pydantic_data)
+# ==================== SLOTS ====================
+def process_yaml_with_slots(path: str = YAML_PATH) -> CompactRecords:
+    """Process YAML file using __slots__ records."""
+    records = list(iter_yaml_records(path, CompactPerson))
+    return CompactRecords(records=records)
+
+
+def print_slots_information(data: CompactRecords) -> None:
+    """Print all information from the slots structure."""
+    print("\n=== PROCESS YAML FILE Using slots data structure ===")
+    write_text(data.records, sys.stdout)
+
+
+# ==================== STREAMING ====================
+_NODE_CLASSES: Dict[Any, Any] = {
+    yaml.ScalarEvent: yaml.ScalarNode,
+    yaml.SequenceStartEvent: yaml.SequenceNode,
+    yaml.MappingStartEvent: yaml.MappingNode,
+}
+
+
+def _start_node(loader: Any, event: Any, anchors: Dict[str, yaml.Node]) -> Any:
+    """Create the node opened by a scalar, sequence start or mapping start event."""
+    node_class = _NODE_CLASSES[type(event)]
+    is_scalar = node_class is yaml.ScalarNode
+    tag = event.tag
+    if tag is None or tag == "!":
+        tag = loader.resolve(
+            node_class, event.value if is_scalar else None, event.implicit
+        )
+    if is_scalar:
+        node = node_class(
+            tag, event.value, event.start_mark, event.end_mark, style=event.style
+        )
+    else:
+        node = node_class(tag, [], event.start_mark, None, flow_style=event.flow_style)
+    if event.anchor is not None:
+        anchors[event.anchor] = node
+    return node
+
+
+def _compose_node(loader: Any, anchors: Dict[str, yaml.Node]) -> yaml.Node:
+    """Build the node for the next complete value from the loader's events.
+
+    This mirrors PyYAML's composer but works on the event API, which both the
+    pure Python and the libyaml loaders expose.
+    """
+    event = loader.get_event()
+    mark = event.start_mark
+    if type(event) is yaml.AliasEvent:
+        if event.anchor not in anchors:
+            raise yaml.composer.ComposerError(
+                None, None, f"found undefined alias {event.anchor!r}", mark
+            )
+        return anchors[event.anchor]
+    if type(event) not in _NODE_CLASSES:
+        raise yaml.composer.ComposerError(
+            None, None, f"unexpected {type(event).__name__}", mark
+        )
 
-    # Process with NamedTuple
-    namedtuple_data = process_yaml_with_namedtuple()
-    print_namedtuple_information(namedtuple_data)
+    node = _start_node(loader, event, anchors)
+    if isinstance(node, yaml.SequenceNode):
+        while not loader.check_event(yaml.SequenceEndEvent):
+            node.value.append(_compose_node(loader, anchors))
+        node.end_mark = loader.get_event().end_mark
+    elif isinstance(node, yaml.MappingNode):
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = _compose_node(loader, anchors)
+            node.value.append((key, _compose_node(loader, anchors)))
+        node.end_mark = loader.get_event().end_mark
+    return cast(yaml.Node, node)
+
+
+def _load_next(loader: Any, anchors: Dict[str, yaml.Node]) -> Any:
+    """Compose and construct the next complete value."""
+    return loader.construct_document(_compose_node(loader, anchors))
+
+
+def _iter_sequence(
+    loader: Any, anchors: Dict[str, yaml.Node]
+) -> Iterator[Dict[str, Any]]:
+    loader.get_event()  # SequenceStartEvent
+    while not loader.check_event(yaml.SequenceEndEvent):
+        yield _load_next(loader, anchors)
+    loader.get_event()  # SequenceEndEvent
+
+
+def _iter_document_records(loader: Any) -> Iterator[Dict[str, Any]]:
+    anchors: Dict[str, yaml.Node] = {}
+    if loader.check_event(yaml.SequenceStartEvent):
+        # A document that is a bare list of records
+        yield from _iter_sequence(loader, anchors)
+        return
+    if not loader.check_event(yaml.MappingStartEvent):
+        _load_next(loader, anchors)  # empty or scalar document, nothing to yield
+        return
+
+    loader.get_event()  # MappingStartEvent
+    has_records = False
+    record: Dict[str, Any] = {}
+    while not loader.check_event(yaml.MappingEndEvent):
+        key = _load_next(loader, anchors)
+        if key == "records" and loader.check_event(yaml.SequenceStartEvent):
+            has_records = True
+            yield from _iter_sequence(loader, anchors)
+        else:
+            record[key] = _load_next(loader, anchors)
+    loader.get_event()  # MappingEndEvent
+
+    # Without a records: sequence the document itself is a single record
+    if not has_records and record:
+        yield record
+
+
+def iter_yaml_record_dicts(path: Source = YAML_PATH) -> Iterator[Dict[str, Any]]:
+    """Yield record dictionaries one at a time from a YAML file.
+
+    Both a single document holding a ``records:`` sequence and a multi-document
+    ``---`` stream (one record, or a list of records, per document) are
+    supported. Only the record currently being built is held in memory.
+    """
+    with open_text_source(path) as f:
+        loader = _Loader(f)
+        try:
+            loader.get_event()  # StreamStartEvent
+            while not loader.check_event(yaml.StreamEndEvent):
+                loader.get_event()  # DocumentStartEvent
+                yield from _iter_document_records(loader)
+                loader.get_event()  # DocumentEndEvent
+        finally:
+            loader.dispose()
+
+
+@overload
+def iter_yaml_records(
+    path: str = ..., model: "Type[FileData]" = ...
+) -> "Iterator[FileData]": ...
+
+
+@overload
+def iter_yaml_records(path: str, model: Type[Person]) -> Iterator[Person]: ...
+
+
+@overload
+def iter_yaml_records(
+    path: str, model: Type[PersonTypedDict]
+) -> Iterator[PersonTypedDict]: ...
+
+
+@overload
+def iter_yaml_records(
+    path: str, model: Type[CompactPerson]
+) -> Iterator[CompactPerson]: ...
+
+
+def iter_yaml_records(path: str = YAML_PATH, model: Any = "pydantic") -> Iterator[Any]:
+    """Yield records of any MODEL_CLASSES model one at a time."""
+    return build_records(iter_yaml_record_dicts(path), MODEL_BUILDERS, model)
+
+
+MODEL_BUILDERS = LazyBuilders(
+    {
+        "pydantic": "pydantic_models:FileData.from_dict",
+        "namedtuple": Person.from_dict,
+        "typeddict": parse_dict_to_typeddict,
+        "slots": CompactPerson.from_dict,
+    }
+)
 
-    # Process with TypedDict
-    typeddict_data = process_yaml_with_typeddict()
-    print_typeddict_information(typeddict_data)
+register_reader((".yaml", ".yml"), iter_yaml_record_dicts, MODEL_BUILDERS)
+
+
+# ==================== MAIN EXECUTION ====================
+def main(
+    models: Sequence[str] = MODELS,
+    path: str = YAML_PATH,
+    cache_dir: Optional[str] = None,
+) -> None:
+    """Main function to run the selected YAML processing methods.
+
+    The file is parsed once and every row is fanned out to all selected models.
+    With a cache_dir (e.g. cache.CACHE_DIR), parsed records of files of at
+    least CACHE_MIN_SIZE bytes are cached there, so later runs on an unchanged
+    file skip the YAML parser entirely.
+    """
+    if cache_dir is None or not worth_caching(path):
+        builders = select_builders(MODEL_BUILDERS, models)
+        results = fan_out(iter_yaml_record_dicts(path), builders)
+    else:
+        builders = select_builders(TYPEDDICT_BUILDERS, models)
+        results = fan_out(iter_cached_rows(path, cache_dir), builders)
+
+    if "pydantic" in results:
+        from pydantic_models import DataSchema
+
+        pydantic_data = DataSchema.from_validated(results["pydantic"])
+        print_pydantic_information(pydantic_data)
+
+    if "namedtuple" in results:
+        namedtuple_data = Records(records=results["namedtuple"])
+        print_namedtuple_information(namedtuple_data)
+
+    if "typeddict" in results:
+        typeddict_data: RecordsTypedDict = {"records": results["typeddict"]}
+        print_typeddict_information(typeddict_data)
+
+    if "slots" in results:
+        slots_data = CompactRecords(records=results["slots"])
+        print_slots_information(slots_data)
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:] or MODELS)
@@ -0,0 +1,391 @@
+import argparse
+import cProfile
+import importlib
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from types import CodeType, FrameType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
+
+from pipeline import MODELS
+
+# The per-record constructors and the parsers they delegate to, reported
+# separately so a regression in one of them stands out; pydantic_models
+# entries are only looked up when the profiled run imported it
+HOT_PATHS = (
+    "models:Person.from_csv_row",
+    "models:Person.from_dict",
+    "models:Person.from_xml_element",
+    "models:CompactPerson.from_csv_row",
+    "models:CompactPerson.from_dict",
+    "models:CompactPerson.from_xml_element",
+    "models:CompactPerson.from_typeddict",
+    "pydantic_models:FileData.from_csv_row",
+    "pydantic_models:FileData.from_dict",
+    "pydantic_models:FileData.from_xml_element",
+    "pydantic_models:validate_file_data",
+    "models:parse_csv_row_to_typeddict",
+    "models:parse_dict_to_typeddict",
+    "models:parse_xml_element_to_typeddict",
+)
+
+SORT_KEYS = ("cumulative", "tottime", "calls")
+DEFAULT_TOP = 25
+# Stack samples are taken at most this often; the interpreter's switch
+# interval (5 ms by default) bounds how often the sampler actually runs
+SAMPLE_INTERVAL = 0.001
+
+
+# ==================== MEMORY ====================
+def reset_peak_rss() -> bool:
+    """Reset the kernel's peak RSS counter where possible (Linux only)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process in bytes (0 if unknown)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# ==================== STACK SAMPLING ====================
+class StackSampler:
+    """Sample the call stack of one thread from a background thread.
+
+    The samples are kept as collapsed stacks ("outer;inner;leaf" -> count),
+    the input format of flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._labels: Dict[CodeType, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._target = 0
+        self._base: Optional[FrameType] = None
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            module = code.co_filename  # e.g. <frozen importlib._bootstrap>
+            if not module.startswith("<"):
+                module = os.path.splitext(os.path.basename(module))[0]
+            label = self._labels[code] = f"{module}:{code.co_qualname}"
+        return label
+
+    def _sample(self) -> None:
+        frame: Optional[FrameType] = sys._current_frames().get(self._target)
+        labels: List[str] = []
+        while frame is not None and frame is not self._base:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        if labels:
+            self.stacks[";".join(reversed(labels))] += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self, base: Optional[FrameType] = None) -> None:
+        """Start sampling the calling thread; frames from base up are left out."""
+        self._target = threading.get_ident()
+        self._base = base
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._base = None
+
+    def write_collapsed(self, f: TextIO) -> None:
+        for stack, count in sorted(self.stacks.items()):
+            f.write(f"{stack} {count}\n")
+
+
+# ==================== REPORT ====================
+@dataclass
+class HotPath:
+    """Profile and allocation totals of one HOT_PATHS function."""
+
+    name: str
+    calls: int = 0
+    tottime: float = 0.0
+    cumtime: float = 0.0
+    allocated: int = 0  # bytes still held at the end, allocated in its body
+    allocations: int = 0
+
+
+@dataclass
+class ProfileReport:
+    """Everything collected while profiling one loader call."""
+
+    result: Any
+    seconds: float
+    stats: pstats.Stats
+    peak_rss: int
+    peak_rss_reset: bool
+    traced_peak: int = 0
+    allocation_sites: List[tracemalloc.Statistic] = field(default_factory=list)
+    hot_paths: List[HotPath] = field(default_factory=list)
+    sampler: Optional[StackSampler] = None
+    # Records loaded, for the records/s figure; set for list results
+    records: Optional[int] = None
+
+    def write(
+        self, f: TextIO, top: int = DEFAULT_TOP, sort: str = "cumulative"
+    ) -> None:
+        """Write the summary, hot paths, top functions and allocation sites."""
+        rate = ""
+        if self.records is not None and self.seconds > 0:
+            rate = f", {self.records:,} records ({self.records / self.seconds:,.0f}/s)"
+        f.write(f"Profiled run: {self.seconds:.3f} s{rate}\n")
+        since = "" if self.peak_rss_reset else " (since process start)"
+        f.write(f"Peak RSS: {self.peak_rss / 2**20:,.1f} MiB{since}\n")
+        if self.traced_peak:
+            f.write(f"Peak traced Python memory: {self.traced_peak / 2**20:,.1f} MiB\n")
+
+        called = [hot for hot in self.hot_paths if hot.calls]
+        f.write("\n=== Record constructors and parsers ===\n")
+        if called:
+            f.write(
+                f"{'function':<42} {'calls':>9} {'tottime':>8} {'cumtime':>8} "
+                f"{'us/call':>8} {'held KiB':>9}\n"
+            )
+            for hot in called:
+                per_call = hot.cumtime / hot.calls * 1e6 if hot.calls else 0
+                f.write(
+                    f"{hot.name:<42} {hot.calls:>9,} {hot.tottime:>8.3f} "
+                    f"{hot.cumtime:>8.3f} {per_call:>8.2f} "
+                    f"{hot.allocated / 1024:>9,.0f}\n"
+                )
+        else:
+            f.write("None of HOT_PATHS ran\n")
+
+        f.write(f"\n=== Top {top} functions sorted by {sort} ===\n")
+        self.stats.stream = f  # type: ignore[attr-defined]
+        self.stats.sort_stats(sort).print_stats(top)
+
+        if self.allocation_sites:
+            f.write(f"=== Top {top} allocation sites still held at the end ===\n")
+            for statistic in self.allocation_sites[:top]:
+                frame = statistic.traceback[0]
+                f.write(
+                    f"{statistic.size / 1024:>10,.0f} KiB {statistic.count:>9,} "
+                    f"blocks  {frame.filename}:{frame.lineno}\n"
+                )
+
+    def write_collapsed(self, f: TextIO) -> None:
+        """Write the sampled stacks in the collapsed (flame graph) format."""
+        if self.sampler is not None:
+            self.sampler.write_collapsed(f)
+
+
+def _resolve(path: str) -> Optional[CodeType]:
+    """The code object of a "module:qualname" function, if its module is loaded."""
+    module_name, _, qualname = path.partition(":")
+    target: Any = sys.modules.get(module_name)
+    if target is None:
+        return None
+    for attribute in qualname.split("."):
+        target = getattr(target, attribute, None)
+    code = getattr(getattr(target, "__func__", target), "__code__", None)
+    return code if isinstance(code, CodeType) else None
+
+
+def _hot_paths(
+    stats: pstats.Stats, allocation_sites: List[tracemalloc.Statistic]
+) -> List[HotPath]:
+    profiled: Dict[Tuple[str, int, str], Tuple[Any, ...]] = stats.stats  # type: ignore[attr-defined]
+    hot_paths = []
+    for path in HOT_PATHS:
+        code = _resolve(path)
+        if code is None:
+            continue
+        hot = HotPath(path.partition(":")[2])
+        entry = profiled.get((code.co_filename, code.co_firstlineno, code.co_name))
+        if entry is not None:
+            _, hot.calls, hot.tottime, hot.cumtime = entry[:4]
+        lines = {line for _, _, line in code.co_lines() if line is not None}
+        for statistic in allocation_sites:
+            frame = statistic.traceback[0]
+            if frame.filename == code.co_filename and frame.lineno in lines:
+                hot.allocated += statistic.size
+                hot.allocations += statistic.count
+        hot_paths.append(hot)
+    return hot_paths
+
+
+def profile_call(
+    func: Callable[..., Any],
+    *args: Any,
+    memory: bool = True,
+    sample_interval: Optional[float] = SAMPLE_INTERVAL,
+    **kwargs: Any,
+) -> ProfileReport:
+    """Run func(*args, **kwargs) under cProfile, tracemalloc and a stack sampler.
+
+    An iterator result is drained into a list inside the profiled run, so
+    lazy loaders such as iter_records are measured doing their work. The
+    allocation snapshot is taken while the result is still alive; memory
+    freed before func returns only shows up in the peaks. memory=False
+    skips tracemalloc, which otherwise slows allocation-heavy code down
+    several times; sample_interval=None skips stack sampling.
+    """
+    sampler = StackSampler(sample_interval) if sample_interval else None
+    profiler = cProfile.Profile()
+    traced_peak = 0
+    allocation_sites: List[tracemalloc.Statistic] = []
+    if memory:
+        tracemalloc.start()
+    try:
+        peak_rss_reset = reset_peak_rss()
+        if sampler is not None:
+            sampler.start(sys._getframe())
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                result = func(*args, **kwargs)
+                if isinstance(result, Iterator):
+                    result = list(result)
+            finally:
+                profiler.disable()
+            seconds = time.perf_counter() - start
+        finally:
+            if sampler is not None:
+                sampler.stop()
+        if memory:
+            traced_peak = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                (
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, threading.__file__),
+                    tracemalloc.Filter(False, cProfile.__file__),
+                    tracemalloc.Filter(False, __file__),
+                )
+            )
+            allocation_sites = snapshot.statistics("lineno")
+    finally:
+        if memory:
+            tracemalloc.stop()
+    report = ProfileReport(
+        result=result,
+        seconds=seconds,
+        stats=pstats.Stats(profiler),
+        peak_rss=peak_rss(),
+        peak_rss_reset=peak_rss_reset,
+        traced_peak=traced_peak,
+        allocation_sites=allocation_sites,
+        sampler=sampler,
+        records=len(result) if isinstance(result, list) else None,
+    )
+    report.hot_paths = _hot_paths(report.stats, report.allocation_sites)
+    return report
+
+
+def _target_call(target: str, model: str) -> Tuple[Callable[..., Any], Tuple[Any, ...]]:
+    """The call for a target: a data file to load, or a module:function."""
+    if ":" in target and not os.path.exists(target):
+        module_name, _, function = target.partition(":")
+        return getattr(importlib.import_module(module_name), function), ()
+    from readers import get_reader, iter_records
+
+    get_reader(target)  # import the format's module before profiling starts
+    return iter_records, (target, model)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Profile a loader with cProfile, tracemalloc and stack sampling."
+    )
+    parser.add_argument(
+        "target",
+        help="data file to load, or module:function to call (e.g. process_xml:main)",
+    )
+    parser.add_argument(
+        "--model",
+        choices=MODELS,
+        default="pydantic",
+        help="model the data file is loaded into",
+    )
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP)
+    parser.add_argument("--sort", choices=SORT_KEYS, default="cumulative")
+    parser.add_argument(
+        "--collapsed", help="write the sampled stacks for a flame graph to this file"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=SAMPLE_INTERVAL,
+        help="seconds between stack samples",
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="skip tracemalloc (faster)"
+    )
+    parser.add_argument(
+        "--show-output",
+        action="store_true",
+        help="let a module:function target print instead of discarding its output",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        func, call_args = _target_call(args.target, args.model)
+    except (ImportError, AttributeError, ValueError) as error:
+        parser.error(str(error))
+    with open(os.devnull, "w") as devnull:
+        with redirect_stdout(sys.stdout if args.show_output else devnull):
+            report = profile_call(
+                func,
+                *call_args,
+                memory=not args.no_memory,
+                sample_interval=args.interval if args.collapsed else None,
+            )
+    report.write(sys.stdout, args.top, args.sort)
+    if args.collapsed:
+        with open(args.collapsed, "w", encoding="utf-8") as f:
+            report.write_collapsed(f)
+        samples = sum(report.sampler.stacks.values()) if report.sampler else 0
+        print(f"Wrote {samples:,} stack samples to {args.collapsed}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# Importing pydantic and compiling these validators is the largest part of
+# the startup time of every tool, so this module is only imported when a
+# pydantic model is first used (see models.__getattr__ and LazyBuilders).
+
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, Iterable, Iterator, List, Mapping
+
+import pydantic
+
+from models import parse_csv_row_to_typeddict, parse_xml_element_to_typeddict
+
+
+# ==================== PYDANTIC MODEL ====================
+class FileNote(pydantic.BaseModel):
+    year: int
+    working_months: int
+    satisfied: bool
+
+
+class FileData(pydantic.BaseModel):
+    name: str
+    age: int
+    id: int
+    salary: int
+    working_years: List[int]
+    is_working: bool
+    notes: List[FileNote] = pydantic.Field(default_factory=list)
+    hobbies: List[str] = pydantic.Field(default_factory=list)
+
+    # Each constructor parses into plain Python data first and validates it
+    # with a single model_validate call, so no FileNote objects are built
+    # (and then revalidated) on the way.
+    @classmethod
+    def from_csv_row(cls, row: Dict[str, str]) -> "FileData":
+        """Create FileData from CSV row with proper parsing."""
+        return cls.model_validate(parse_csv_row_to_typeddict(row))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FileData":
+        """Create FileData from dictionary; missing notes/hobbies default to []."""
+        return cls.model_validate(data)
+
+    @classmethod
+    def from_xml_element(cls, element: ET.Element) -> "FileData":
+        """Create FileData from XML element with proper parsing."""
+        return cls.model_validate(parse_xml_element_to_typeddict(element))
+
+
+class DataSchema(pydantic.BaseModel):
+    records: List[FileData]
+
+    @classmethod
+    def from_validated(cls, records: List[FileData]) -> "DataSchema":
+        """Wrap records that are already validated FileData without revalidating."""
+        return cls.model_construct(records=records)
+
+
+# Building a TypeAdapter compiles a validator, so it is built once and reused
+FILE_DATA_LIST = pydantic.TypeAdapter(List[FileData])
+VALIDATION_BATCH_SIZE = 1000
+
+
+def validate_file_data(
+    rows: Iterable[Mapping[str, Any]], batch_size: int = VALIDATION_BATCH_SIZE
+) -> Iterator[FileData]:
+    """Validate plain record dicts into FileData, one TypeAdapter call per batch."""
+    batch: List[Mapping[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield from FILE_DATA_LIST.validate_python(batch)
+            batch.clear()
+    if batch:
+        yield from FILE_DATA_LIST.validate_python(batch)
@@ -0,0 +1,271 @@
+import bz2
+import gzip
+import importlib
+import io
+import lzma
+import os
+from contextlib import ExitStack, contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TextIO,
+    Type,
+    Union,
+    cast,
+    overload,
+)
+
+from instrumentation import instrument, measure, metered
+from models import (
+    CompactPerson,
+    CompactRecords,
+    Person,
+    PersonTypedDict,
+    Records,
+    RecordsTypedDict,
+    model_name,
+)
+
+if TYPE_CHECKING:
+    from pydantic_models import DataSchema, FileData
+
+# Modules that register the built-in formats when they are imported; only
+# the module of a requested extension is imported
+_BUILTIN_READER_MODULES = {
+    ".csv": "process_csv",
+    ".json": "process_JSON",
+    ".yaml": "process_yaml",
+    ".yml": "process_yaml",
+    ".xml": "process_xml",
+    ".rec": "record_file",
+}
+
+
+# A file path, or a binary file object that is already open for reading
+Source = Union[str, BinaryIO]
+
+
+def _open_zstd(f: BinaryIO) -> Any:
+    try:
+        zstd = importlib.import_module("compression.zstd")  # Python 3.14+
+        return zstd.ZstdFile(f)
+    except ImportError:
+        pass
+    try:
+        zstandard = importlib.import_module("zstandard")
+    except ImportError:
+        raise ValueError(
+            "Reading .zst files needs Python 3.14+ or the zstandard package"
+        ) from None
+    return zstandard.ZstdDecompressor().stream_reader(f, closefd=False)
+
+
+# Decompressed data is read ahead in blocks this large; decompressing in small
+# pieces interleaved with parsing is markedly slower (e.g. ~35% for bz2 XML)
+DECOMPRESS_BUFFER_SIZE = 1024 * 1024
+
+# Compression suffixes that are decompressed on the fly while reading
+DECOMPRESSORS: Dict[str, Callable[[BinaryIO], Any]] = {
+    ".gz": lambda f: gzip.GzipFile(fileobj=f, mode="rb"),
+    ".bz2": bz2.BZ2File,
+    ".xz": lzma.LZMAFile,
+    ".zst": _open_zstd,
+}
+
+
+def compression_of(path: str) -> Optional[str]:
+    """The DECOMPRESSORS suffix of path, or None for an uncompressed file."""
+    extension = os.path.splitext(path)[1].lower()
+    return extension if extension in DECOMPRESSORS else None
+
+
+def decompress(f: BinaryIO, name: str) -> BinaryIO:
+    """Wrap f in a streaming decompressor when name has a compression suffix.
+
+    Closing the wrapper leaves f open; uncompressed files are returned as is.
+    """
+    compression = compression_of(name)
+    if compression is None:
+        return f
+    decompressed = DECOMPRESSORS[compression](f)
+    return cast(BinaryIO, io.BufferedReader(decompressed, DECOMPRESS_BUFFER_SIZE))
+
+
+@contextmanager
+def open_source(source: Source) -> Iterator[BinaryIO]:
+    """Open a path for binary reading, or pass an open binary file through.
+
+    Paths (and named files) ending in a DECOMPRESSORS suffix are decompressed
+    as a stream while the parser reads them, without temporary files. With
+    instrumentation enabled, the reads are counted as the read stage.
+    """
+    with ExitStack() as stack:
+        if isinstance(source, str):
+            f: BinaryIO = stack.enter_context(open(source, "rb"))
+            name = source
+        else:
+            f = source
+            name = getattr(source, "name", "")
+        if isinstance(name, str) and compression_of(name):
+            f = stack.enter_context(decompress(f, name))
+        reader = metered(f)
+        if reader is not f:
+            stack.enter_context(reader)
+        yield reader
+
+
+@contextmanager
+def open_text_source(source: Source) -> Iterator[TextIO]:
+    """Like open_source, decoded as UTF-8 with line endings left untouched."""
+    with open_source(source) as f:
+        text = io.TextIOWrapper(f, encoding="utf-8", newline="")
+        try:
+            yield text
+        finally:
+            text.detach()  # leave closing a passed-in file to its owner
+
+
+class FormatReader(NamedTuple):
+    """Streaming source of raw rows plus the builders turning a row into a model."""
+
+    iter_rows: Callable[[Source], Iterator[Any]]
+    builders: Mapping[str, Callable[[Any], Any]]
+
+
+_READERS: Dict[str, FormatReader] = {}
+
+
+def register_reader(
+    extensions: Sequence[str],
+    iter_rows: Callable[[Source], Iterator[Any]],
+    builders: Mapping[str, Callable[[Any], Any]],
+) -> None:
+    """Register the record source and model builders for file extensions."""
+    for extension in extensions:
+        _READERS[extension.lower()] = FormatReader(iter_rows, builders)
+
+
+def reader_for_extension(extension: str) -> FormatReader:
+    """Return the reader registered for a file extension such as ".csv"."""
+    extension = extension.lower()
+    if extension not in _READERS and extension in _BUILTIN_READER_MODULES:
+        importlib.import_module(_BUILTIN_READER_MODULES[extension])
+    try:
+        return _READERS[extension]
+    except KeyError:
+        supported = sorted({*_READERS, *_BUILTIN_READER_MODULES})
+        raise ValueError(
+            f"No reader registered for {extension or 'files without extension'}; "
+            f"supported: {', '.join(supported)}"
+        ) from None
+
+
+def get_reader(path: str) -> FormatReader:
+    """Return the reader registered for the extension of path.
+
+    A trailing compression suffix is skipped, so data.csv.gz is read as CSV.
+    """
+    root = os.path.splitext(path)[0] if compression_of(path) else path
+    try:
+        return reader_for_extension(os.path.splitext(root)[1])
+    except ValueError as error:
+        raise ValueError(f"{path}: {error}") from None
+
+
+def build_records(
+    rows: Iterable[Any], builders: Mapping[str, Callable[[Any], Any]], model: Any
+) -> Iterator[Any]:
+    """Lazily turn raw rows into records of the chosen model.
+
+    model is a model class or its MODEL_NAMES name ("pydantic" avoids
+    importing pydantic before it is needed). FileData rows are first parsed
+    into plain dicts by the TypedDict builder and then validated in batches
+    through the cached TypeAdapter.
+
+    With instrumentation enabled, producing rows is timed as the tokenize
+    stage and each later step as convert, validate or build.
+    """
+    name = model_name(model)
+    rows = instrument("tokenize", iter(rows))
+    if name == "pydantic":
+        with measure("validate"):  # the first import builds the validators
+            from pydantic_models import validate_file_data
+
+        dicts = instrument("convert", map(builders["typeddict"], rows))
+        return instrument("validate", validate_file_data(dicts))
+    return instrument("build", map(builders[name], rows))
+
+
+@overload
+def iter_records(path: str, model: "Type[FileData]" = ...) -> "Iterator[FileData]": ...
+
+
+@overload
+def iter_records(path: str, model: Type[Person]) -> Iterator[Person]: ...
+
+
+@overload
+def iter_records(
+    path: str, model: Type[PersonTypedDict]
+) -> Iterator[PersonTypedDict]: ...
+
+
+@overload
+def iter_records(path: str, model: Type[CompactPerson]) -> Iterator[CompactPerson]: ...
+
+
+@overload
+def iter_records(path: str, model: str) -> Iterator[Any]: ...
+
+
+def iter_records(path: str, model: Any = "pydantic") -> Iterator[Any]:
+    """Stream records of any registered format as the chosen model."""
+    reader = get_reader(path)
+    return build_records(reader.iter_rows(path), reader.builders, model)
+
+
+@overload
+def load_records(path: str, model: "Type[FileData]" = ...) -> "DataSchema": ...
+
+
+@overload
+def load_records(path: str, model: Type[Person]) -> Records: ...
+
+
+@overload
+def load_records(path: str, model: Type[PersonTypedDict]) -> RecordsTypedDict: ...
+
+
+@overload
+def load_records(path: str, model: Type[CompactPerson]) -> CompactRecords: ...
+
+
+def load_records(
+    path: str, model: Any = "pydantic"
+) -> Union["DataSchema", Records, RecordsTypedDict, CompactRecords]:
+    """Load a file of any registered format, detected from its extension.
+
+    Returns the container matching the model: DataSchema for FileData,
+    Records for Person, RecordsTypedDict for PersonTypedDict and
+    CompactRecords for CompactPerson.
+    """
+    name = model_name(model)
+    records = list(iter_records(path, model))
+    if name == "pydantic":
+        from pydantic_models import DataSchema
+
+        return DataSchema.from_validated(records)
+    if name == "namedtuple":
+        return Records(records=records)
+    if name == "slots":
+        return CompactRecords(records=records)
+    return {"records": records}
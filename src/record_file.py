@@ -0,0 +1,123 @@
+import mmap
+import struct
+import sys
+import time
+from dataclasses import fields
+from typing import Any, Dict, Iterator
+
+import numpy as np
+
+from models import TYPEDDICT_BUILDERS, PersonTypedDict
+from readers import Source, compression_of, open_source, register_reader
+from record_table import RecordTable
+
+# File layout (all integers little-endian):
+#   header     magic, version, column count, record count
+#   directory  one entry per RecordTable column: name, dtype, offset, nbytes
+#   columns    the raw column buffers, each starting on a _ALIGNMENT boundary
+# Fixed-width columns (age, id, salary, is_working) hold one value per record;
+# variable-length fields are flat value columns plus n + 1 offset columns, the
+# same Arrow-style layout RecordTable uses in memory.
+MAGIC = b"PRECORDS"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIQ")
+_COLUMN = struct.Struct("<32s8sQQ")
+_ALIGNMENT = 64
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def write_record_file(path: str, table: RecordTable) -> None:
+    """Write table in the fixed-layout record file format."""
+    columns = [(field.name, getattr(table, field.name)) for field in fields(table)]
+    offset = _aligned(_HEADER.size + _COLUMN.size * len(columns))
+    directory = []
+    for name, column in columns:
+        directory.append((name, column, offset))
+        offset = _aligned(offset + column.nbytes)
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(columns), len(table)))
+        for name, column, start in directory:
+            dtype = column.dtype.newbyteorder("<").str
+            f.write(_COLUMN.pack(name.encode(), dtype.encode(), start, column.nbytes))
+        for _, column, start in directory:
+            f.seek(start)
+            f.write(np.ascontiguousarray(column, column.dtype.newbyteorder("<")))
+
+
+def open_record_file(path: str) -> RecordTable:
+    """Map a record file into memory and return zero-copy column views.
+
+    Nothing is parsed or copied: every column is a read-only NumPy view of the
+    mapping, and pages are only read from disk when they are touched. The map
+    is shared through the page cache, so any number of processes can open the
+    same file at the cost of one copy in memory. It stays open for as long as
+    the returned table (or any array taken from it) is alive.
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _table_from_buffer(mapped, path)
+
+
+def _table_from_buffer(buffer: Any, path: str) -> RecordTable:
+    """Column views over a buffer holding a whole record file."""
+    if len(buffer) < _HEADER.size:
+        raise ValueError(f"{path} is not a record file")
+    magic, version, column_count, _ = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a record file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported record file version {version} in {path}")
+
+    views: Dict[str, Any] = {}
+    for i in range(column_count):
+        name, dtype, offset, nbytes = _COLUMN.unpack_from(
+            buffer, _HEADER.size + i * _COLUMN.size
+        )
+        column_dtype = np.dtype(dtype.rstrip(b"\0").decode())
+        views[name.rstrip(b"\0").decode()] = np.frombuffer(
+            buffer, column_dtype, nbytes // column_dtype.itemsize, offset
+        )
+    names = [field.name for field in fields(RecordTable)]
+    missing = [name for name in names if name not in views]
+    if missing:
+        raise ValueError(f"{path} lacks the columns {', '.join(missing)}")
+    return RecordTable(**{name: views[name] for name in names})
+
+
+def iter_record_file_rows(path: Source) -> Iterator[PersonTypedDict]:
+    """Yield every record of a record file as a PersonTypedDict.
+
+    Plain paths are memory-mapped; open or compressed files are read into
+    memory first.
+    """
+    if isinstance(path, str) and not compression_of(path):
+        table = open_record_file(path)
+    else:
+        with open_source(path) as f:
+            table = _table_from_buffer(f.read(), getattr(f, "name", "<stream>"))
+    return table.iter_dicts()
+
+
+register_reader((".rec",), iter_record_file_rows, TYPEDDICT_BUILDERS)
+
+
+def main() -> None:
+    """Convert a data file to a record file and time opening it."""
+    source = sys.argv[1] if len(sys.argv) > 1 else "data/documents.csv"
+    target = sys.argv[2] if len(sys.argv) > 2 else source.rsplit(".", 1)[0] + ".rec"
+    write_record_file(target, RecordTable.from_file(source))
+
+    start = time.perf_counter()
+    table = open_record_file(target)
+    person = table.row(len(table) - 1)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {len(table):,} records to {target}")
+    print(f"Opened and read the last record in {elapsed * 1000:.2f} ms: {person}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from cache import CACHE_DIR, cache_path, cached_table, read_entry, write_entry
+from models import Person
+from record_table import IntArray, RecordTable
+
+# Inclusive (low, high) bounds of a range query; None leaves that side open
+Bounds = Tuple[Optional[int], Optional[int]]
+
+
+@dataclass(frozen=True)
+class SortedIndex:
+    """Values of one column in ascending order, with the row of each value."""
+
+    values: npt.NDArray[Any]
+    rows: IntArray
+
+    @classmethod
+    def build(cls, column: npt.NDArray[Any]) -> "SortedIndex":
+        order = np.argsort(column, kind="stable").astype(np.int64)
+        return cls(values=column[order], rows=order)
+
+    def between(self, low: Optional[int], high: Optional[int]) -> IntArray:
+        """Rows whose value lies in [low, high], found by binary search."""
+        start = 0 if low is None else int(np.searchsorted(self.values, low, "left"))
+        end = (
+            len(self.values)
+            if high is None
+            else int(np.searchsorted(self.values, high, "right"))
+        )
+        return self.rows[start:end]
+
+
+@dataclass(frozen=True)
+class InvertedIndex:
+    """Rows holding each distinct key, stored as offsets into one row array.
+
+    The rows of keys[i] are rows[offsets[i]:offsets[i + 1]], in row order.
+    keys are sorted, so lookups are binary searches over the saved arrays
+    and loading an index creates no per-key Python objects.
+    """
+
+    keys: npt.NDArray[Any]
+    offsets: IntArray
+    rows: IntArray
+
+    @classmethod
+    def build(cls, keys: npt.ArrayLike, rows: IntArray) -> "InvertedIndex":
+        """Index rows[i] under keys[i]; rows must be in ascending order."""
+        unique, inverse = np.unique(np.asarray(keys), return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        grouped_keys, grouped_rows = inverse[order], rows[order]
+        # Drop repeats, e.g. a record with two notes in the same year
+        keep = np.ones(len(grouped_rows), dtype=np.bool_)
+        keep[1:] = (grouped_keys[1:] != grouped_keys[:-1]) | (
+            grouped_rows[1:] != grouped_rows[:-1]
+        )
+        offsets = np.zeros(len(unique) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(grouped_keys[keep], minlength=len(unique)), out=offsets[1:]
+        )
+        return cls(keys=unique, offsets=offsets, rows=grouped_rows[keep])
+
+    def lookup(self, key: Any) -> IntArray:
+        """Rows holding key, or an empty array."""
+        position = int(np.searchsorted(self.keys, key))
+        if position == len(self.keys) or self.keys[position] != key:
+            return self.rows[:0]
+        return self.rows[self.offsets[position] : self.offsets[position + 1]]
+
+
+# Names of the RecordIndex fields of each kind, and of their saved arrays
+_INVERTED_INDEXES = ("by_id", "by_name", "by_hobby", "by_note_year")
+_SORTED_INDEXES = ("by_salary", "by_age")
+_ARRAY_NAMES = [
+    *(
+        f"{name}__{part}"
+        for name in _INVERTED_INDEXES
+        for part in ("keys", "offsets", "rows")
+    ),
+    *(f"{name}__{part}" for name in _SORTED_INDEXES for part in ("values", "rows")),
+]
+
+
+@dataclass(frozen=True)
+class RecordIndex:
+    """Secondary indexes over the records of a RecordTable.
+
+    id, name, hobby and note year lookups and salary and age ranges are all
+    binary searches (O(log n) plus the size of the result).
+    """
+
+    table: RecordTable
+    by_id: InvertedIndex
+    by_name: InvertedIndex
+    by_salary: SortedIndex
+    by_age: SortedIndex
+    by_hobby: InvertedIndex
+    by_note_year: InvertedIndex
+
+    @classmethod
+    def build(cls, table: RecordTable) -> "RecordIndex":
+        """Index every record of table."""
+        rows = np.arange(len(table), dtype=np.int64)
+        return cls(
+            table=table,
+            by_id=InvertedIndex.build(table.id, rows),
+            by_name=InvertedIndex.build(np.array(table.names(), dtype=str), rows),
+            by_salary=SortedIndex.build(table.salary),
+            by_age=SortedIndex.build(table.age),
+            by_hobby=InvertedIndex.build(
+                np.array(table.flat_hobbies(), dtype=str),
+                np.repeat(rows, table.hobbies_count()),
+            ),
+            by_note_year=InvertedIndex.build(
+                table.note_year, table.notes_record_index()
+            ),
+        )
+
+    def get_by_id(self, record_id: int) -> Optional[Person]:
+        """The record with this id, or None."""
+        rows = self.by_id.lookup(record_id)
+        return self.table.row(int(rows[0])) if len(rows) else None
+
+    def get_by_name(self, name: str) -> RecordTable:
+        """All records with exactly this name."""
+        return self.table.take(self.by_name.lookup(name))
+
+    def range(
+        self, salary: Optional[Bounds] = None, age: Optional[Bounds] = None
+    ) -> RecordTable:
+        """Records within all the given inclusive bounds, in table order.
+
+        e.g. index.range(salary=(3000, None), age=(30, 40))
+        """
+        matches = [
+            index.between(*bounds)
+            for index, bounds in ((self.by_salary, salary), (self.by_age, age))
+            if bounds is not None
+        ]
+        if not matches:
+            return self.table
+        rows = matches[0]
+        for other in matches[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return self.table.take(np.sort(rows))
+
+    def with_hobby(self, hobby: str) -> RecordTable:
+        """Records listing this hobby."""
+        return self.table.take(self.by_hobby.lookup(hobby))
+
+    def with_note_year(self, year: int) -> RecordTable:
+        """Records with at least one note for this year."""
+        return self.table.take(self.by_note_year.lookup(year))
+
+    def arrays(self) -> Dict[str, npt.NDArray[Any]]:
+        """Every index array, keyed as <index>__<array> for saving."""
+        arrays: Dict[str, npt.NDArray[Any]] = {}
+        for name in _INVERTED_INDEXES:
+            inverted: InvertedIndex = getattr(self, name)
+            arrays[f"{name}__keys"] = inverted.keys
+            arrays[f"{name}__offsets"] = inverted.offsets
+            arrays[f"{name}__rows"] = inverted.rows
+        for name in _SORTED_INDEXES:
+            sorted_index: SortedIndex = getattr(self, name)
+            arrays[f"{name}__values"] = sorted_index.values
+            arrays[f"{name}__rows"] = sorted_index.rows
+        return arrays
+
+    @classmethod
+    def from_arrays(
+        cls, table: RecordTable, arrays: Mapping[str, npt.NDArray[Any]]
+    ) -> "RecordIndex":
+        """Rebuild an index saved by arrays()."""
+        indexes: Dict[str, Any] = {}
+        for name in _INVERTED_INDEXES:
+            indexes[name] = InvertedIndex(
+                keys=arrays[f"{name}__keys"],
+                offsets=arrays[f"{name}__offsets"],
+                rows=arrays[f"{name}__rows"],
+            )
+        for name in _SORTED_INDEXES:
+            indexes[name] = SortedIndex(
+                values=arrays[f"{name}__values"], rows=arrays[f"{name}__rows"]
+            )
+        return cls(table=table, **indexes)
+
+
+# ==================== PERSISTENCE ====================
+def index_path(path: str, cache_dir: str = CACHE_DIR) -> str:
+    """Location of the index file of a source path, next to its table cache."""
+    return cache_path(path, cache_dir)[: -len(".npz")] + ".index.npz"
+
+
+def save_index(path: str, index: RecordIndex, cache_dir: str = CACHE_DIR) -> None:
+    """Store the index of path, keyed by the current source like the cache."""
+    write_entry(index_path(path, cache_dir), path, index.arrays())
+
+
+def load_index(
+    path: str, table: RecordTable, cache_dir: str = CACHE_DIR
+) -> Optional[RecordIndex]:
+    """Return the saved index of path, or None if the source has changed."""
+    arrays = read_entry(index_path(path, cache_dir), path, _ARRAY_NAMES)
+    return None if arrays is None else RecordIndex.from_arrays(table, arrays)
+
+
+def cached_index(path: str, cache_dir: str = CACHE_DIR) -> RecordIndex:
+    """Load the records and index of path from the cache, building what is missing."""
+    table = cached_table(path, cache_dir)
+    index = load_index(path, table, cache_dir)
+    if index is None:
+        index = RecordIndex.build(table)
+        try:
+            save_index(path, index, cache_dir)
+        except OSError:
+            pass  # e.g. a read-only cache_dir: the index is rebuilt next time
+    return index
+
+
+def main() -> None:
+    """Build or load the index of a file and run a few lookups."""
+    path = sys.argv[1] if len(sys.argv) > 1 else "data/documents.csv"
+    start = time.perf_counter()
+    index = cached_index(path)
+    elapsed = time.perf_counter() - start
+    print(f"Loaded {len(index.table):,} indexed records in {elapsed:.3f} s")
+
+    print(f"get_by_id(1): {index.get_by_id(1)}")
+    high_paid = index.range(salary=(5000, None))
+    print(f"range(salary=(5000, None)): {len(high_paid)} records")
+    print(f"range(age=(30, 40)): {len(index.range(age=(30, 40)))} records")
+    print(f'with_hobby("tennis"): {len(index.with_hobby("tennis"))} records')
+    print(f"with_note_year(2020): {len(index.with_note_year(2020))} records")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,13 +15,6 @@ def process_data(data: list[int | None]) -> list[int]:
     return result
 
 
-# process_data(...)
-
-print(process_data([5, 15, 25, 3, 8, 12]))
-
-print(process_data([5, 15, 25, 3, 8, 12]))
-
-
 A = [
     [1, 2, 3],
     [4, 5, 6],
@@ -34,3 +27,9 @@ B = [
     [7, 8, 9],
 ]
 # print(process_data(["1", "2", "3", "5", "4"]))
+
+
+if __name__ == "__main__":
+    print(process_data([5, 15, 25, 3, 8, 12]))
+
+    print(process_data([5, 15, 25, 3, 8, 12]))
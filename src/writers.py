@@ -0,0 +1,364 @@
+import argparse
+import json
+import os
+import re
+import sys
+from array import array
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+)
+
+from instrumentation import measure
+from models import NoteTypedDict, PersonTypedDict, record_to_typeddict
+from readers import iter_records
+
+# Records are joined into one string and written every WRITE_BATCH records
+WRITE_BATCH = 1000
+
+CSV_HEADER = (
+    "name,age,id,salary,working_years,is_working,"
+    "notes_year,notes_working_months,notes_satisfied,hobbies\n"
+)
+
+_YAML_PLAIN = re.compile(r"[A-Za-z][A-Za-z0-9 _.-]*[A-Za-z0-9_.]|[A-Za-z]")
+_YAML_RESERVED = {"true", "false", "yes", "no", "on", "off", "y", "n", "null"}
+
+
+def _write_batched(f: TextIO, chunks: Iterable[str]) -> None:
+    """Write chunks in large joined batches instead of one write per chunk.
+
+    Each chunk is one record; with instrumentation enabled the formatting
+    and writing are timed as the output stage.
+    """
+    buffer: List[str] = []
+    records = characters = 0
+    with measure("output") as stage:
+        for chunk in chunks:
+            buffer.append(chunk)
+            if len(buffer) >= WRITE_BATCH:
+                text = "".join(buffer)
+                f.write(text)
+                records += len(buffer)
+                characters += len(text)
+                buffer.clear()
+        if buffer:
+            text = "".join(buffer)
+            f.write(text)
+            records += len(buffer)
+            characters += len(text)
+        if stage is not None:
+            stage.items += records
+            stage.bytes += characters
+
+
+def _bool(value: bool) -> str:
+    return "true" if value else "false"
+
+
+# ==================== CSV ====================
+def _csv_quote(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _csv_line(record: PersonTypedDict) -> str:
+    notes: List[NoteTypedDict] = record.get("notes", [])
+    if notes:
+        notes_columns = ",".join(
+            (
+                _csv_quote(";".join(str(note["year"]) for note in notes)),
+                _csv_quote(";".join(str(note["working_months"]) for note in notes)),
+                _csv_quote(";".join(_bool(note["satisfied"]) for note in notes)),
+            )
+        )
+    else:
+        notes_columns = ",,"
+    hobbies = record.get("hobbies", [])
+    years = ",".join(str(year) for year in record["working_years"])
+    return (
+        f"{_csv_quote(record['name'])},{record['age']},{record['id']},"
+        f"{record['salary']},{_csv_quote(years)},{_bool(record['is_working'])},"
+        f"{notes_columns},{_csv_quote(','.join(hobbies)) if hobbies else ''}\n"
+    )
+
+
+def write_csv(records: Iterable[PersonTypedDict], f: TextIO) -> None:
+    """Write records in the documents.csv layout.
+
+    Lists are joined with "," inside one quoted column, and the note columns
+    are joined with ";", matching the parsers in models.py.
+    """
+    f.write(CSV_HEADER)
+    _write_batched(f, (_csv_line(record) for record in records))
+
+
+# ==================== JSON ====================
+def _json_object(record: PersonTypedDict) -> Dict[str, object]:
+    """The record with empty notes/hobbies left out, like the sample file."""
+    data: Dict[str, object] = {
+        "name": record["name"],
+        "age": record["age"],
+        "id": record["id"],
+        "salary": record["salary"],
+        "working_years": record["working_years"],
+        "is_working": record["is_working"],
+    }
+    if record.get("notes"):
+        data["notes"] = record["notes"]
+    if record.get("hobbies"):
+        data["hobbies"] = record["hobbies"]
+    return data
+
+
+def _json_chunks(records: Iterable[PersonTypedDict]) -> Iterator[str]:
+    separator = "\n"
+    for record in records:
+        text = json.dumps(_json_object(record), indent=4)
+        yield separator + "        " + text.replace("\n", "\n        ")
+        separator = ",\n"
+
+
+def write_json(records: Iterable[PersonTypedDict], f: TextIO) -> None:
+    """Write records in the documents.json layout ({"records": [...]})."""
+    f.write('{\n    "records": [')
+    _write_batched(f, _json_chunks(records))
+    f.write("\n    ]\n}\n")
+
+
+def write_jsonl(records: Iterable[PersonTypedDict], f: TextIO) -> None:
+    """Write records as JSON Lines, one compact record object per line."""
+    _write_batched(
+        f,
+        (
+            json.dumps(_json_object(record), separators=(",", ":")) + "\n"
+            for record in records
+        ),
+    )
+
+
+# ==================== YAML ====================
+def _yaml_str(text: str) -> str:
+    """Plain scalar when it is unambiguous, else a double-quoted one."""
+    if _YAML_PLAIN.fullmatch(text) and text.lower() not in _YAML_RESERVED:
+        return text
+    return json.dumps(text)  # JSON strings are valid double-quoted YAML
+
+
+def _yaml_record(record: PersonTypedDict) -> str:
+    lines = [
+        f"  - name: {_yaml_str(record['name'])}",
+        f"    age: {record['age']}",
+        f"    id: {record['id']}",
+        f"    salary: {record['salary']}",
+        "    working_years:",
+        *(f"      - {year}" for year in record["working_years"]),
+        f"    is_working: {_bool(record['is_working'])}",
+    ]
+    notes = record.get("notes", [])
+    if notes:
+        lines.append("    notes:")
+        for note in notes:
+            lines.append(f"      - year: {note['year']}")
+            lines.append(f"        working_months: {note['working_months']}")
+            lines.append(f"        satisfied: {_bool(note['satisfied'])}")
+    hobbies = record.get("hobbies", [])
+    if hobbies:
+        lines.append("    hobbies:")
+        lines.extend(f"      - {_yaml_str(hobby)}" for hobby in hobbies)
+    return "\n".join(lines) + "\n\n"
+
+
+def write_yaml(records: Iterable[PersonTypedDict], f: TextIO) -> None:
+    """Write records in the documents.YAML layout (a records: sequence)."""
+    f.write("records:\n")
+    _write_batched(f, (_yaml_record(record) for record in records))
+
+
+# ==================== XML ====================
+def _xml_escape(text: str) -> str:
+    # Same as xml.sax.saxutils.escape, which imports urllib and http.client
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _xml_record(record: PersonTypedDict) -> str:
+    lines = [
+        "    <record>",
+        f"        <name>{_xml_escape(record['name'])}</name>",
+        f"        <age>{record['age']}</age>",
+        f"        <id>{record['id']}</id>",
+        f"        <salary>{record['salary']}</salary>",
+        "        <working_years>",
+        *(f"            <year>{year}</year>" for year in record["working_years"]),
+        "        </working_years>",
+        f"        <is_working>{_bool(record['is_working'])}</is_working>",
+    ]
+    notes = record.get("notes", [])
+    if notes:
+        lines.append("        <notes>")
+        for note in notes:
+            lines.append("            <note>")
+            lines.append(f"                <year>{note['year']}</year>")
+            lines.append(
+                "                <working_months>"
+                f"{note['working_months']}</working_months>"
+            )
+            lines.append(
+                f"                <satisfied>{_bool(note['satisfied'])}</satisfied>"
+            )
+            lines.append("            </note>")
+        lines.append("        </notes>")
+    hobbies = record.get("hobbies", [])
+    if hobbies:
+        lines.append("        <hobbies>")
+        lines.extend(
+            f"            <hobby>{_xml_escape(hobby)}</hobby>" for hobby in hobbies
+        )
+        lines.append("        </hobbies>")
+    lines.append("    </record>")
+    return "\n".join(lines) + "\n"
+
+
+def write_xml(records: Iterable[PersonTypedDict], f: TextIO) -> None:
+    """Write records in the documents.xml layout (<records><record>...)."""
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n<records>\n')
+    _write_batched(f, (_xml_record(record) for record in records))
+    f.write("</records>\n")
+
+
+WRITERS: Dict[str, Callable[[Iterable[PersonTypedDict], TextIO], None]] = {
+    "csv": write_csv,
+    "json": write_json,
+    "yaml": write_yaml,
+    "xml": write_xml,
+}
+
+
+# ==================== TEXT ====================
+# The human-readable layouts of the process_* scripts. They take records of
+# any MODEL_CLASSES model, and notes are shown with the model's own repr.
+SEPARATOR = "-" * 40 + "\n"
+
+
+def _text_record(record: Any) -> str:
+    if isinstance(record, dict):
+        name, age, record_id, salary = (
+            record["name"],
+            record["age"],
+            record["id"],
+            record["salary"],
+        )
+        years, working = record["working_years"], record["is_working"]
+        notes, hobbies = record.get("notes", []), record.get("hobbies", [])
+    else:
+        name, age, record_id, salary = record.name, record.age, record.id, record.salary
+        years, working = record.working_years, record.is_working
+        notes, hobbies = record.notes, record.hobbies
+        if isinstance(years, array):
+            years = years.tolist()
+    return (
+        f"Name: {name}\nAge: {age}\nID: {record_id}\nSalary: {salary}\n"
+        f"Working Years: {years}\nCurrently Working: {working}\n"
+        f"Notes: {notes}\nHobbies: {hobbies}\n{SEPARATOR}"
+    )
+
+
+def write_text(records: Iterable[Any], f: TextIO) -> None:
+    """Write one "Field: value" line per field of each record."""
+    _write_batched(f, map(_text_record, records))
+
+
+def _details_record(record: Any) -> str:
+    person = record_to_typeddict(record)
+    lines = [
+        f"\n--- Person ID: {person['id']} ---",
+        f"Name: {person['name']}",
+        f"Age: {person['age']}",
+        f"Salary: ${person['salary']}",
+        f"Currently Working: {person['is_working']}",
+        f"Working Years: {person['working_years']}",
+        "Notes:",
+    ]
+    notes = person.get("notes", [])
+    if notes:
+        lines.extend(
+            f"  - Year: {note['year']}, Months: {note['working_months']}, "
+            f"Status: {'Satisfied' if note['satisfied'] else 'Not Satisfied'}"
+            for note in notes
+        )
+    else:
+        lines.append("  No notes available")
+    lines.append("Hobbies:")
+    hobbies = person.get("hobbies", [])
+    if hobbies:
+        lines.extend(f"  - {hobby}" for hobby in hobbies)
+    else:
+        lines.append("  No hobbies listed")
+    return "\n".join(lines) + "\n" + SEPARATOR
+
+
+def write_details(records: Iterable[Any], f: TextIO) -> None:
+    """Write the detailed layout, listing every note and hobby on its own line."""
+    _write_batched(f, map(_details_record, records))
+
+
+# ==================== EXPORT ====================
+# Exporters take records of any MODEL_CLASSES model; data formats convert
+# each record to a PersonTypedDict on the way, one record at a time.
+EXPORTERS: Dict[str, Callable[[Iterable[Any], TextIO], None]] = {
+    "csv": lambda records, f: write_csv(map(record_to_typeddict, records), f),
+    "json": lambda records, f: write_json(map(record_to_typeddict, records), f),
+    "jsonl": lambda records, f: write_jsonl(map(record_to_typeddict, records), f),
+    "yaml": lambda records, f: write_yaml(map(record_to_typeddict, records), f),
+    "xml": lambda records, f: write_xml(map(record_to_typeddict, records), f),
+    "text": write_text,
+    "details": write_details,
+}
+
+
+def export_records(records: Iterable[Any], f: TextIO, fmt: str) -> None:
+    """Stream records of any model to f in one of the EXPORTERS formats."""
+    try:
+        exporter = EXPORTERS[fmt]
+    except KeyError:
+        raise ValueError(
+            f"Unknown export format {fmt!r}; expected one of {', '.join(EXPORTERS)}"
+        ) from None
+    exporter(records, f)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert a documents.* file to another format."
+    )
+    parser.add_argument("source", help="file of any registered format")
+    parser.add_argument("target", help='output file, or "-" for stdout')
+    parser.add_argument(
+        "--format",
+        choices=EXPORTERS,
+        help="output format (default: the extension of target)",
+    )
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt is None:
+        fmt = os.path.splitext(args.target)[1].lstrip(".").lower()
+        fmt = {"yml": "yaml", "txt": "text"}.get(fmt, fmt)
+        if fmt not in EXPORTERS:
+            parser.error(f"cannot tell the format of {args.target}; use --format")
+    records = iter_records(args.source, PersonTypedDict)
+    if args.target == "-":
+        export_records(records, sys.stdout, fmt)
+    else:
+        with open(args.target, "w", encoding="utf-8", newline="") as f:
+            export_records(records, f, fmt)
+
+
+if __name__ == "__main__":
+    main()